@@ -0,0 +1,366 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import date, datetime, timedelta
+import inspect
+import os
+import random
+from pathlib import Path
+
+from aggregation import aggregate_partial, finalize, merge_partials, month_key
+from catalog import get_catalog
+from live_feed import POLL_SECONDS, LiveTotals
+from moments import MomentAccumulator
+from warm_cache import fingerprint, get_warm_cache
+
+# Shared setup for the admin dashboard. Imported once per process, so the
+# reference data below is built a single time no matter how often main.py
+# reruns. Only what every page needs (the sidebar's moments and live feed,
+# rollups, the warm cache) is imported up front; the engines behind single
+# pages (sketches, rolling windows, forecasts, registry dedupe) are imported
+# by the functions that use them, the first time a page asks.
+#
+# Data is sharded by hospital branch. Each branch has its own dataset,
+# moments, sketches and aggregate partials, cached in memory and on disk
+# under its own key, so viewing (or adding) one branch never touches the
+# others. Pages read totals from the moments and every table and chart from
+# rollups, so the "All Branches" view merges small per-branch partials.
+# Only Patient Details (which lists rows) and the exact billing percentiles
+# and distinct counts (which do not merge; the sketches are their mergeable
+# stand-in) read the branches' rows side by side.
+
+catalog = get_catalog()
+
+# Everything the generated dataset depends on: its parameters, today's
+# date (appointments are relative to it) and the code and catalog behind it
+BASE_DIR = Path(__file__).resolve().parent
+SOURCE_FILES = [BASE_DIR / name for name in ("admin_data.py", "catalog.py", "patient_registry.py")]
+
+def dataset_fingerprint(num_patients, branch_id=0):
+    files = SOURCE_FILES + ([os.environ["HOSPITAL_CATALOG"]] if os.environ.get("HOSPITAL_CATALOG") else [])
+    return fingerprint("dummy_data", num_patients, catalog.branches[branch_id], date.today().isoformat(), files=files)
+
+# Entries derived from a branch's dataset also depend on how they are built:
+# their parameters and the modules that build them
+def entry_fingerprint(num_patients, branch_id, *params, builders=()):
+    return fingerprint(dataset_fingerprint(num_patients, branch_id), *params,
+                       files=[BASE_DIR / name for name in builders])
+
+# Generate dummy data for 100 patients of one branch. Kept in memory per
+# process and on disk across restarts, so a new process starts warm.
+@st.cache_data
+def generate_dummy_data(num_patients=100, branch_id=0):
+    return load_branch_frame(num_patients, branch_id)
+
+# Same data without Streamlit's cache, for tools outside the dashboard
+# (api_server.py); shares the disk cache with it
+def load_branch_frame(num_patients, branch_id):
+    return get_warm_cache().frame(f"dummy_data_b{branch_id}", dataset_fingerprint(num_patients, branch_id),
+                                  lambda: _generate_dummy_data(num_patients, branch_id))
+
+def _generate_dummy_data(num_patients, branch_id=0):
+    from patient_registry import deduplicate
+    
+    branch = catalog.branches[branch_id]
+    np.random.seed(42 + 1000 * branch_id)
+    random.seed(42 + 1000 * branch_id)
+    
+    first_names = ["Amit", "Priya", "Raj", "Neha", "Sanjay", "Anjali", "Ravi", "Meera", 
+                   "Vikram", "Pooja", "Arun", "Kavita", "Rahul", "Sneha", "Karan"]
+    last_names = ["Sharma", "Patel", "Kumar", "Singh", "Gupta", "Verma", "Shah", "Mehta"]
+    
+    departments = [d.name for d in catalog.departments]
+    lab_test_names = [t.name for t in catalog.lab_tests]
+    
+    data = []
+    start_date = datetime.now() - timedelta(days=365)
+    
+    # Pool of people; some of them come back for more visits, sometimes
+    # typing their mobile or email differently
+    people = []
+    for j in range(max(1, int(num_patients * 0.6))):
+        age = random.randint(1, 80)
+        people.append({
+            "name": f"{random.choice(first_names)} {random.choice(last_names)}",
+            "age": age,
+            "gender": random.choice(["Male", "Female"]),
+            "blood_group": random.choice(["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]),
+            "dob": (datetime.now() - timedelta(days=age * 365 + random.randint(0, 364))).date(),
+            "mobile": f"{random.randint(7000000000, 9999999999)}",
+            "email": f"patient{j+1}@email.com"
+        })
+    
+    for i in range(num_patients):
+        person = random.choice(people)
+        mobile, email = person["mobile"], person["email"]
+        if random.random() < 0.1:
+            mobile = f"+91 {mobile[:5]} {mobile[5:]}"
+        if random.random() < 0.1:
+            email = email.capitalize()
+        
+        # Random date within last year
+        random_days = random.randint(0, 365)
+        appointment_date = start_date + timedelta(days=random_days)
+        
+        # Select department and doctor
+        dept = random.choice(departments)
+        doctor = random.choice(catalog.doctors_in(dept))
+        
+        # Generate symptoms based on department
+        dept_symptoms = [s.name for s in catalog.symptoms_in(dept)]
+        num_symptoms = random.randint(1, 3)
+        symptoms = random.sample(dept_symptoms, min(num_symptoms, len(dept_symptoms)))
+        
+        # Lab tests
+        num_tests = random.randint(0, 3)
+        selected_tests = random.sample(lab_test_names, num_tests)
+        lab_cost = sum(catalog.lab_prices[test] for test in selected_tests)
+        
+        # Consultation fee varies by department
+        base_fee = 500
+        if dept == "Cardiology":
+            consultation_fee = random.randint(800, 1500)
+        elif dept == "Neurology":
+            consultation_fee = random.randint(700, 1200)
+        elif dept == "Radiology":
+            consultation_fee = random.randint(300, 800)
+        else:
+            consultation_fee = random.randint(400, 1000)
+        
+        patient = {
+            "patient_id": f"P{i+1:03d}" if branch_id == 0 else f"{branch.code}-P{i+1:03d}",
+            "branch": branch.name,
+            "name": person["name"],
+            "age": person["age"],
+            "gender": person["gender"],
+            "blood_group": person["blood_group"],
+            "dob": person["dob"],
+            "mobile": mobile,
+            "email": email,
+            "department": dept,
+            "doctor_name": doctor.name,
+            "doctor_room": doctor.room,
+            "doctor_experience": doctor.experience,
+            "symptoms": ", ".join(symptoms),
+            "num_symptoms": len(symptoms),
+            "appointment_date": appointment_date.date(),
+            "appointment_time": random.choice(catalog.time_slots),
+            "patient_type": None,
+            "lab_tests": ", ".join(selected_tests) if selected_tests else "None",
+            "num_lab_tests": len(selected_tests),
+            "lab_cost": lab_cost,
+            "consultation_fee": consultation_fee,
+            "total_billing": consultation_fee + lab_cost,
+            "day_of_week": appointment_date.strftime("%A"),
+            "month": appointment_date.strftime("%B"),
+            "year": appointment_date.year,
+            "quarter": f"Q{(appointment_date.month-1)//3 + 1}"
+        }
+        data.append(patient)
+    
+    # Same person, same registry ID; their first visit is the "New Patient" one
+    df = pd.DataFrame(data)
+    registry_ids, patient_types = deduplicate(df)
+    df.insert(1, 'registry_id', f"{branch.code}-" + registry_ids)
+    df['patient_type'] = patient_types
+    return df
+
+NUM_PATIENTS = 100
+
+# Columns tracked by the streaming moment accumulator (Trend Analysis
+# heatmap, averages and standard deviations)
+MOMENT_COLUMNS = ['age', 'num_symptoms', 'num_lab_tests', 'consultation_fee',
+                  'lab_cost', 'total_billing', 'doctor_experience']
+
+ALL_BRANCHES = "All Branches"
+
+def selected_branch():
+    return st.session_state.get('branch', ALL_BRANCHES)
+
+def branch_ids():
+    # Branch shards behind the current selection
+    branch = selected_branch()
+    if branch == ALL_BRANCHES:
+        return tuple(b.id for b in catalog.branches)
+    return (catalog.branch_by_name[branch].id,)
+
+# Rows of the selected branch. The network view concatenates the shards,
+# for Patient Details and the exact distribution tables only.
+@st.cache_data
+def network_data(num_patients=NUM_PATIENTS):
+    return pd.concat([generate_dummy_data(num_patients, b.id) for b in catalog.branches], ignore_index=True)
+
+def branch_data(num_patients=NUM_PATIENTS):
+    ids = branch_ids()
+    return generate_dummy_data(num_patients, ids[0]) if len(ids) == 1 else network_data(num_patients)
+
+# One accumulator per branch and process, built from the branch's dataset.
+# Bookings confirmed at the desks are folded into the feed tailer's own
+# per-branch accumulators, one update_record() each, as they arrive.
+@st.cache_resource
+def branch_moments(branch_id, num_patients=NUM_PATIENTS):
+    return get_warm_cache().object(f"moments_b{branch_id}",
+        entry_fingerprint(num_patients, branch_id, MOMENT_COLUMNS, builders=["moments.py"]),
+        lambda: MomentAccumulator.from_frame(generate_dummy_data(num_patients, branch_id), MOMENT_COLUMNS))
+
+def dataset_moments(num_patients=NUM_PATIENTS, live=True):
+    # Rebuilt on every call from the branch accumulators and the live feed's
+    # (polled at most every POLL_SECONDS): a few small matrix merges, and it
+    # stays current as bookings come in. live=False leaves today's feed out,
+    # for figures shown next to the rollups, which are built from the dataset
+    ids = branch_ids()
+    merged = MomentAccumulator(MOMENT_COLUMNS)
+    for branch_id in ids:
+        merged.merge(branch_moments(branch_id, num_patients))
+    if not live:
+        return merged
+    feed = live_totals()
+    feed.poll()
+    return merged.merge(feed.moments({catalog.branches[branch_id].name for branch_id in ids}))
+
+# Sketches for the approximate analytics mode, maintained per branch and per
+# department, doctor and month. Keys match the `by` argument of
+# distribution_stats().
+@st.cache_resource
+def branch_sketches(branch_id, num_patients=NUM_PATIENTS):
+    from sketches import build_group_sketches
+
+    def build():
+        df = generate_dummy_data(num_patients, branch_id)
+        return {
+            'department': build_group_sketches(df, 'department'),
+            'doctor_name': build_group_sketches(df, 'doctor_name'),
+            'month_key': build_group_sketches(df.assign(month_key=month_key(df)), 'month_key'),
+        }
+    return get_warm_cache().object(f"sketches_b{branch_id}",
+        entry_fingerprint(num_patients, branch_id, builders=["sketches.py", "aggregation.py"]), build)
+
+@st.cache_resource
+def merged_sketches(ids, num_patients=NUM_PATIENTS):
+    from sketches import merge_group_sketches
+    shards = [branch_sketches(branch_id, num_patients) for branch_id in ids]
+    return {by: merge_group_sketches([shard[by] for shard in shards]) for by in shards[0]}
+
+def dataset_sketches(num_patients=NUM_PATIENTS):
+    ids = branch_ids()
+    return branch_sketches(ids[0], num_patients) if len(ids) == 1 else merged_sketches(ids, num_patients)
+
+# Page-level rollups (aggregate() tables). Each branch keeps its own merged
+# partial, computed once per dataset version and kept on disk; the selected
+# branches' partials are merged and finalized on every call, which costs
+# one small groupby per branch instead of a pass over the rows.
+@st.cache_data
+def branch_partial(branch_id, name, by, spec, partition_by="month", _prepare=None, num_patients=NUM_PATIENTS):
+    def build():
+        df = generate_dummy_data(num_patients, branch_id)
+        return aggregate_partial(_prepare(df) if _prepare else df, by, spec, partition_by)
+    # A prepare function is hashed through the page module defining it
+    builders = ["aggregation.py"] + ([inspect.getsourcefile(_prepare)] if _prepare else [])
+    return get_warm_cache().frame(f"partial_{name}_b{branch_id}",
+        entry_fingerprint(num_patients, branch_id, by, spec, partition_by, builders=builders), build)
+
+def rollup(name, by, spec, partition_by="month", prepare=None, num_patients=NUM_PATIENTS):
+    partials = [branch_partial(branch_id, name, by, spec, partition_by, prepare, num_patients)
+                for branch_id in branch_ids()]
+    return finalize(merge_partials(partials), by, spec)
+
+def rollup_counts(name, by, partition_by="month", prepare=None, num_patients=NUM_PATIENTS):
+    # Appointments per key, largest first like value_counts()
+    counts = rollup(name, by, {'patient_id': 'count'}, partition_by, prepare, num_patients)
+    return counts.set_index(by)['patient_id'].sort_values(ascending=False)
+
+# Per-day prefix sums per department or doctor for the rolling-window
+# views. Every branch is built on the same calendar (the last year) and
+# entity list, so the network prefix is the sum of the branch prefixes.
+def rolling_entities(by):
+    if by == 'department':
+        return [d.name for d in catalog.departments]
+    return [d.name for d in catalog.doctors]
+
+@st.cache_resource
+def branch_prefix(branch_id, by, num_patients=NUM_PATIENTS):
+    from rolling import DailyPrefix
+    end = date.today()
+    start = end - timedelta(days=365)
+    return get_warm_cache().object(f"prefix_{by}_b{branch_id}",
+        entry_fingerprint(num_patients, branch_id, start, end, builders=["rolling.py"]),
+        lambda: DailyPrefix.from_frame(generate_dummy_data(num_patients, branch_id), by, rolling_entities(by), start, end))
+
+@st.cache_resource
+def merged_prefix(ids, by, num_patients=NUM_PATIENTS):
+    from rolling import DailyPrefix
+    shards = [branch_prefix(branch_id, by, num_patients) for branch_id in ids]
+    merged = DailyPrefix(shards[0].entities, shards[0].start, shards[0].days)
+    for shard in shards:
+        merged.merge(shard)
+    return merged
+
+def daily_prefix(by, num_patients=NUM_PATIENTS):
+    ids = branch_ids()
+    return branch_prefix(ids[0], by, num_patients) if len(ids) == 1 else merged_prefix(ids, by, num_patients)
+
+# Appointments per (entity, day, slot) over the same one-year calendar,
+# per branch; additive across branches like the prefixes above
+@st.cache_resource
+def branch_slot_counts(branch_id, by, num_patients=NUM_PATIENTS):
+    from forecast import slot_counts
+    end = date.today()
+    start = end - timedelta(days=365)
+    return get_warm_cache().object(f"slots_{by}_b{branch_id}",
+        entry_fingerprint(num_patients, branch_id, start, catalog.time_slots, builders=["forecast.py"]),
+        lambda: slot_counts(generate_dummy_data(num_patients, branch_id), by, rolling_entities(by),
+                            start, 366, catalog.time_slots))
+
+# Holt-Winters fits for every department or doctor of the selected
+# branches, keyed by the data version of each branch so they are refitted
+# only when the data changes
+@st.cache_resource
+def fitted_forecast(ids, by, versions):
+    from forecast import HoltWintersBatch
+
+    def fit():
+        counts = sum(branch_slot_counts(branch_id, by) for branch_id in ids)
+        return HoltWintersBatch(7 * len(catalog.time_slots)).fit(counts)
+    return get_warm_cache().object(f"forecast_{by}", fingerprint(ids, versions, files=[BASE_DIR / "forecast.py"]), fit)
+
+def load_forecast(by, num_patients=NUM_PATIENTS):
+    ids = branch_ids()
+    return fitted_forecast(ids, by, tuple(dataset_fingerprint(num_patients, b) for b in ids))
+
+def analytics_mode():
+    return st.session_state.get('analytics_mode', 'Exact')
+
+# Live mode: today's bookings confirmed at the desks (health_app.py), tailed
+# from the shared feed. One tailer per process, polled at most every
+# POLL_SECONDS however many screens watch.
+@st.cache_resource
+def live_totals():
+    return LiveTotals(moment_columns=MOMENT_COLUMNS)
+
+def live_mode():
+    return st.session_state.get('live_mode', False)
+
+def live_snapshot():
+    branch = selected_branch()
+    live_totals().poll()
+    return live_totals().totals(None if branch == ALL_BRANCHES else branch)
+
+def live_fragment(func):
+    # Fragment that reruns itself on the poll timer while live mode is on
+    return st.fragment(run_every=POLL_SECONDS if live_mode() else None)(func)
+
+def distribution_stats(by, num_patients=NUM_PATIENTS):
+    from sketches import distribution_table, exact_distribution_table
+    if analytics_mode() == 'Approximate':
+        return distribution_table(dataset_sketches()[by])
+    df = branch_data(num_patients)
+    if by == 'month_key':
+        df = df.assign(month_key=month_key(df))
+    return exact_distribution_table(df, by)
+
+DISTRIBUTION_FORMAT = {
+    'Distinct Patients': '{:,.0f}',
+    'Median Billing': '₹{:,.0f}',
+    'P95 Billing': '₹{:,.0f}',
+    'P99 Billing': '₹{:,.0f}'
+}
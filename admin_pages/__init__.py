@@ -0,0 +1,21 @@
+import importlib
+
+# Page registry: navigation label -> module inside this package. Each page
+# module exposes render(), reads the selected branches' data through
+# admin_data and keeps its own heavy imports, so a page (and whatever it
+# pulls in, e.g. make_subplots for Trend Analysis) is only imported the
+# first time somebody opens it. Python keeps the module in sys.modules
+# afterwards, so later reruns pay nothing for it.
+PAGES = {
+    "📊 Overview": "overview",
+    "👨‍⚕️ Doctor Analytics": "doctor_analytics",
+    "🩺 Department Analytics": "department_analytics",
+    "💰 Revenue Analytics": "revenue_analytics",
+    "📈 Trend Analysis": "trend_analysis",
+    "🔮 Forecast": "forecast",
+    "📋 Patient Details": "patient_details",
+}
+
+
+def load_page(label):
+    return importlib.import_module(f"{__name__}.{PAGES[label]}")
@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from admin_data import DISTRIBUTION_FORMAT, analytics_mode, dataset_sketches, distribution_stats, rollup, rollup_counts
+
+
+# One row per (appointment, symptom), for the symptom counts rollup
+def explode_symptoms(frame):
+    symptoms = frame['symptoms'].str.split(',')
+    return frame.assign(symptom=symptoms).explode('symptom').assign(symptom=lambda f: f['symptom'].str.strip())
+
+
+# ==================== DEPARTMENT ANALYTICS PAGE ====================
+def render():
+    st.header("🩺 Department Analytics")
+    
+    dept_stats = rollup('department_stats', 'department', {
+        'patient_id': 'count',
+        'total_billing': 'sum',
+        'consultation_fee': 'mean',
+        'lab_cost': 'sum',
+        'num_lab_tests': 'mean',
+        'age': 'mean'
+    }, partition_by='month')
+    dept_stats.columns = ['Department', 'Patients', 'Total Revenue', 'Avg Consultation', 'Lab Revenue', 'Avg Lab Tests',
+                          'Avg Age']
+    
+    # Key Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Departments", len(dept_stats))
+    with col2:
+        top_dept = dept_stats.sort_values('Patients', ascending=False).iloc[0]
+        st.metric("Busiest Department", top_dept['Department'])
+    with col3:
+        st.metric("Highest Revenue Dept", dept_stats.sort_values('Total Revenue', ascending=False).iloc[0]['Department'])
+    with col4:
+        st.metric("Avg Patients/Dept", f"{dept_stats['Patients'].mean():.1f}")
+    
+    st.markdown("---")
+    
+    # Department Stats Table
+    st.subheader("📊 Department Performance Summary")
+    st.dataframe(dept_stats.style.format({
+        'Patients': '{:.0f}',
+        'Total Revenue': '₹{:,.0f}',
+        'Avg Consultation': '₹{:,.0f}',
+        'Lab Revenue': '₹{:,.0f}',
+        'Avg Lab Tests': '{:.2f}',
+        'Avg Age': '{:.1f}'
+    }), use_container_width=True)
+    
+    # Billing distribution and reach (exact or sketch-backed)
+    st.subheader(f"💳 Billing Distribution & Distinct Patients ({analytics_mode()})")
+    dist_stats = distribution_stats('department').rename(columns={'Key': 'Department'})
+    st.dataframe(dist_stats.style.format(DISTRIBUTION_FORMAT), use_container_width=True)
+    
+    # Visualizations
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Patient Distribution by Department")
+        fig = px.pie(dept_stats, values='Patients', names='Department', hole=0.4)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Revenue by Department")
+        fig = px.bar(dept_stats, x='Department', y='Total Revenue', color='Department')
+        fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Symptoms Analysis
+    st.markdown("---")
+    st.subheader("🩺 Symptom Analysis by Department")
+    selected_dept = st.selectbox("Select Department", dept_stats['Department'].tolist())
+    dept = dept_stats.set_index('Department').loc[selected_dept]
+    
+    if analytics_mode() == 'Approximate':
+        top_symptoms = dataset_sketches()['department'][selected_dept].symptoms.top(10)
+        symptom_counts = pd.Series(dict(top_symptoms), dtype=int)
+    else:
+        symptom_counts = rollup_counts('department_symptoms', ['department', 'symptom'],
+                                       prepare=explode_symptoms)[selected_dept]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(x=symptom_counts.index[:10], y=symptom_counts.values[:10],
+                     labels={'x': 'Symptom', 'y': 'Frequency'},
+                     title=f"Top 10 Symptoms in {selected_dept}")
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.metric("Total Patients", int(dept['Patients']))
+        st.metric("Avg Age", f"{dept['Avg Age']:.1f} years")
+        st.metric("Total Revenue", f"₹{dept['Total Revenue']:,.0f}")
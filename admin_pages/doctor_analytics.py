@@ -0,0 +1,88 @@
+import streamlit as st
+import plotly.express as px
+
+from admin_data import DISTRIBUTION_FORMAT, analytics_mode, distribution_stats, rollup, rollup_counts
+
+
+# ==================== DOCTOR ANALYTICS PAGE ====================
+def render():
+    st.header("👨‍⚕️ Doctor Performance Analytics")
+    
+    # Doctor-wise patient count
+    doctor_stats = rollup('doctor_stats', 'doctor_name', {
+        'patient_id': 'count',
+        'total_billing': 'sum',
+        'consultation_fee': 'mean',
+        'department': 'first',
+        'doctor_experience': 'first'
+    }, partition_by='department')
+    doctor_stats.columns = ['Doctor', 'Patients', 'Total Revenue', 'Avg Consultation Fee', 'Department', 'Experience']
+    doctor_stats = doctor_stats.sort_values('Patients', ascending=False)
+    
+    # Top Metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        top_doctor = doctor_stats.iloc[0]
+        st.metric("Top Doctor by Patients", top_doctor['Doctor'], f"{int(top_doctor['Patients'])} patients")
+    with col2:
+        top_revenue_doctor = doctor_stats.sort_values('Total Revenue', ascending=False).iloc[0]
+        st.metric("Top Doctor by Revenue", top_revenue_doctor['Doctor'], f"₹{top_revenue_doctor['Total Revenue']:,.0f}")
+    with col3:
+        st.metric("Average Patients/Doctor", f"{doctor_stats['Patients'].mean():.1f}")
+    
+    st.markdown("---")
+    
+    # Doctor Performance Table
+    st.subheader("📋 Doctor Performance Summary")
+    st.dataframe(doctor_stats.style.format({
+        'Patients': '{:.0f}',
+        'Total Revenue': '₹{:,.0f}',
+        'Avg Consultation Fee': '₹{:,.0f}',
+        'Experience': '{:.0f} years'
+    }), use_container_width=True)
+    
+    # Billing distribution and reach (exact or sketch-backed)
+    st.subheader(f"💳 Billing Distribution & Distinct Patients ({analytics_mode()})")
+    dist_stats = distribution_stats('doctor_name').rename(columns={'Key': 'Doctor'})
+    st.dataframe(dist_stats.style.format(DISTRIBUTION_FORMAT), use_container_width=True)
+    
+    # Visualizations
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Patients per Doctor")
+        fig = px.bar(doctor_stats, x='Doctor', y='Patients', color='Department',
+                     hover_data=['Experience', 'Total Revenue'])
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Revenue per Doctor")
+        fig = px.bar(doctor_stats, x='Doctor', y='Total Revenue', color='Department')
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Experience vs Performance
+    st.subheader("Experience vs Patients Correlation")
+    fig = px.scatter(doctor_stats, x='Experience', y='Patients', size='Total Revenue',
+                     color='Department', hover_name='Doctor', size_max=60)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Time-wise analysis for selected doctor
+    st.markdown("---")
+    st.subheader("🕐 Time Slot Analysis by Doctor")
+    selected_doctor = st.selectbox("Select Doctor", doctor_stats['Doctor'].tolist())
+    
+    time_dist = rollup_counts('doctor_time_slots', ['doctor_name', 'appointment_time'],
+                              partition_by='department')[selected_doctor].sort_index()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(x=time_dist.index, y=time_dist.values,
+                     labels={'x': 'Time Slot', 'y': 'Number of Patients'})
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        day_dist = rollup_counts('doctor_days', ['doctor_name', 'day_of_week'], partition_by='department')[selected_doctor]
+        fig = px.pie(values=day_dist.values, names=day_dist.index, title="Day-wise Distribution")
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,79 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from datetime import date, timedelta
+
+from admin_data import branch_ids, catalog, load_forecast, rolling_entities
+
+
+# ==================== FORECAST PAGE ====================
+def render():
+    st.header("🔮 Staffing Forecast")
+    st.caption("Expected appointments for the next 7 days from Holt-Winters models "
+               "(trend plus day-of-week × time-slot seasonality), fitted to every series at once.")
+    
+    group = st.radio("Forecast For", ['Department', 'Doctor'], horizontal=True, key="forecast_group")
+    by = 'department' if group == 'Department' else 'doctor_name'
+    
+    slots = catalog.time_slots
+    entities = rolling_entities(by)
+    model = load_forecast(by)
+    load = model.forecast(7 * len(slots)).reshape(len(entities), 7, len(slots))
+    
+    # One appointment per doctor per slot in every selected branch
+    branches = len(branch_ids())
+    if by == 'department':
+        per_slot = np.array([len(catalog.doctors_in(name)) for name in entities]) * branches
+    else:
+        per_slot = np.full(len(entities), branches)
+    capacity = per_slot * 7 * len(slots)
+    expected = load.sum(axis=(1, 2))
+    
+    days = [date.today() + timedelta(days=i + 1) for i in range(7)]
+    peak = load.reshape(len(entities), -1).argmax(axis=1)
+    summary = pd.DataFrame({
+        group: entities,
+        'Expected Next Week': expected,
+        'Capacity': capacity,
+        'Utilization': expected / capacity,
+        'Peak Slot': [f"{days[p // len(slots)].strftime('%a %d/%m')} {slots[p % len(slots)]}" for p in peak],
+        'Alpha': model.params[:, 0],
+        'Beta': model.params[:, 1],
+        'Gamma': model.params[:, 2],
+        'RMSE': model.rmse,
+    }).sort_values('Utilization', ascending=False)
+    
+    # Key Metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Expected Appointments", f"{expected.sum():,.0f}")
+    with col2:
+        st.metric("Slot Capacity", f"{capacity.sum():,}")
+    with col3:
+        st.metric("Utilization", f"{expected.sum() / capacity.sum():.1%}")
+    
+    st.subheader("Next Week: Expected Load vs Capacity")
+    fig = px.bar(summary, x=group, y=['Expected Next Week', 'Capacity'], barmode='group',
+                 labels={'value': 'Appointments', 'variable': ''})
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(summary.style.format({
+        'Expected Next Week': '{:,.1f}',
+        'Capacity': '{:,}',
+        'Utilization': '{:.1%}',
+        'Alpha': '{:.3f}',
+        'Beta': '{:.3f}',
+        'Gamma': '{:.3f}',
+        'RMSE': '{:.3f}'
+    }), use_container_width=True)
+    
+    # Slot-level view for one department or doctor
+    st.subheader("Expected Utilization by Day and Slot")
+    selected = st.selectbox(f"Select {group}", entities, key="forecast_entity")
+    row = entities.index(selected)
+    utilization = pd.DataFrame(load[row] / per_slot[row],
+                               index=[d.strftime('%a %d/%m') for d in days], columns=list(slots))
+    fig = px.imshow(utilization, text_auto='.0%', aspect='auto', zmin=0, zmax=1,
+                    color_continuous_scale='YlOrRd', labels={'color': 'Utilization'})
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,145 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from admin_data import (ALL_BRANCHES, catalog, dataset_moments, live_fragment, live_mode, live_snapshot, rollup,
+                        rollup_counts, selected_branch)
+from aggregation import month_key
+
+
+# Today's bookings confirmed at the desks (live feed); reruns on its own timer
+def live_panel():
+    snapshot = live_snapshot()
+    # New bookings in the selected branches since the last refresh; none
+    # when the branch selection changed or the feed started a new day
+    branch, seen = st.session_state.get('overview_live_seen', (None, 0))
+    new = max(snapshot['appointments'] - seen, 0) if branch == selected_branch() else 0
+    st.session_state.overview_live_seen = (selected_branch(), snapshot['appointments'])
+    
+    st.subheader("🔴 Live Bookings Today")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Live Bookings", snapshot['appointments'], f"+{new} new" if new else None)
+    with col2:
+        st.metric("Live Revenue", f"₹{snapshot['revenue']:,.0f}")
+    with col3:
+        busiest = max(snapshot['by_department'], key=snapshot['by_department'].get, default="—")
+        st.metric("Busiest Department", busiest)
+    
+    if snapshot['appointments']:
+        col1, col2 = st.columns(2)
+        with col1:
+            live_depts = pd.Series(snapshot['by_department']).sort_values(ascending=False)
+            fig = px.bar(x=live_depts.index, y=live_depts.values,
+                         labels={'x': 'Department', 'y': 'Bookings'})
+            fig.update_traces(marker_color='#F38181')
+            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            recent = pd.DataFrame(snapshot['recent'][::-1])
+            st.dataframe(recent[['appointment_date', 'time_slot', 'department', 'doctor_name', 'total_billing']],
+                         use_container_width=True)
+    else:
+        st.info("No bookings in the live feed yet today")
+
+
+# ==================== OVERVIEW PAGE ====================
+def render():
+    st.header("📊 Hospital Overview")
+    
+    # Totals from the merged branch moments, without today's feed so they
+    # add up with the rollup charts below; live bookings are in the live
+    # panel and the sidebar
+    moments = dataset_moments(live=False)
+    
+    # Key Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Patients", moments.n)
+    with col2:
+        st.metric("Total Revenue", f"₹{moments.n * moments.means()['total_billing']:,.0f}")
+    with col3:
+        st.metric("Avg Revenue/Patient", f"₹{moments.means()['total_billing']:,.0f}",
+                  f"σ ₹{moments.std()['total_billing']:,.0f}", delta_color="off")
+    with col4:
+        st.metric("Total Doctors", len(catalog.doctors))
+    
+    if live_mode():
+        live_fragment(live_panel)()
+    
+    # Retention, on registry IDs so the same person counts once
+    visits = rollup_counts('patient_visits', 'registry_id')
+    returning = int((visits > 1).sum())
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Unique Patients", len(visits))
+    with col2:
+        st.metric("Returning Patients", returning)
+    with col3:
+        st.metric("Repeat Visit Rate", f"{returning / len(visits):.1%}" if len(visits) else "0.0%")
+    with col4:
+        st.metric("Avg Visits/Patient", f"{visits.mean():.2f}" if len(visits) else "0.00")
+    
+    # Network view: one row per branch, merged from the branch partials
+    if selected_branch() == ALL_BRANCHES:
+        st.subheader("Branches")
+        branch_stats = rollup('branch_stats', 'branch', {
+            'patient_id': 'count',
+            'total_billing': 'sum',
+            'consultation_fee': 'mean'
+        }, partition_by='month')
+        branch_stats.columns = ['Branch', 'Patients', 'Total Revenue', 'Avg Consultation']
+        st.dataframe(branch_stats.style.format({
+            'Total Revenue': '₹{:,.0f}',
+            'Avg Consultation': '₹{:,.0f}'
+        }), use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Charts from the merged branch rollups
+    # Row 1: Department Distribution and Patient Type
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Patients by Department")
+        dept_counts = rollup_counts('department_counts', 'department')
+        fig = px.pie(values=dept_counts.values, names=dept_counts.index, 
+                     hole=0.4, color_discrete_sequence=px.colors.qualitative.Set3)
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Patient Type Distribution")
+        patient_type_counts = rollup_counts('patient_type_counts', 'patient_type')
+        fig = px.bar(x=patient_type_counts.index, y=patient_type_counts.values,
+                     color=patient_type_counts.index,
+                     labels={'x': 'Patient Type', 'y': 'Count'})
+        fig.update_layout(showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Row 2: Gender and Age Distribution
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Gender Distribution")
+        gender_counts = rollup_counts('gender_counts', 'gender')
+        fig = px.pie(values=gender_counts.values, names=gender_counts.index,
+                     color_discrete_sequence=['#FF6B6B', '#4ECDC4'])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Age Distribution")
+        age_counts = rollup_counts('age_counts', 'age')
+        fig = px.histogram(x=age_counts.index, y=age_counts.values, histfunc='sum', nbins=20,
+                          labels={'x': 'Age'})
+        fig.update_traces(marker_color='#95E1D3')
+        fig.update_layout(yaxis_title='Number of Patients')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Monthly Patient Trend
+    st.subheader("Monthly Patient Trend")
+    monthly_data = rollup_counts('monthly_patients', 'month_key',
+                                 prepare=lambda frame: frame.assign(month_key=month_key(frame))).sort_index().reset_index()
+    monthly_data.columns = ['Month', 'Patients']
+    fig = px.line(monthly_data, x='Month', y='Patients', markers=True)
+    fig.update_traces(line_color='#F38181', line_width=3)
+    st.plotly_chart(fig, use_container_width=True)
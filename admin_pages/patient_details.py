@@ -0,0 +1,98 @@
+import streamlit as st
+from datetime import datetime
+
+from admin_data import branch_data
+
+
+# ==================== PATIENT DETAILS PAGE ====================
+def render():
+    st.header("📋 Patient Records")
+    
+    # The one page that needs the rows themselves
+    df = branch_data()
+    
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        dept_filter = st.multiselect("Filter by Department", 
+                                     options=['All'] + list(df['department'].unique()),
+                                     default=['All'])
+    with col2:
+        gender_filter = st.multiselect("Filter by Gender",
+                                      options=['All'] + list(df['gender'].unique()),
+                                      default=['All'])
+    with col3:
+        patient_type_filter = st.multiselect("Filter by Patient Type",
+                                            options=['All'] + list(df['patient_type'].unique()),
+                                            default=['All'])
+    
+    # Apply filters
+    filtered_df = df.copy()
+    if 'All' not in dept_filter and dept_filter:
+        filtered_df = filtered_df[filtered_df['department'].isin(dept_filter)]
+    if 'All' not in gender_filter and gender_filter:
+        filtered_df = filtered_df[filtered_df['gender'].isin(gender_filter)]
+    if 'All' not in patient_type_filter and patient_type_filter:
+        filtered_df = filtered_df[filtered_df['patient_type'].isin(patient_type_filter)]
+    
+    st.info(f"Showing {len(filtered_df)} of {len(df)} patients")
+    
+    # Display data
+    display_df = filtered_df[[
+        'patient_id', 'registry_id', 'branch', 'name', 'age', 'gender', 'department', 'doctor_name',
+        'appointment_date', 'appointment_time', 'symptoms', 'lab_tests',
+        'consultation_fee', 'lab_cost', 'total_billing'
+    ]].copy()
+    
+    st.dataframe(display_df.style.format({
+        'consultation_fee': '₹{:,.0f}',
+        'lab_cost': '₹{:,.0f}',
+        'total_billing': '₹{:,.0f}'
+    }), use_container_width=True)
+    
+    # Download option
+    csv = filtered_df.to_csv(index=False)
+    st.download_button(
+        label="📥 Download Patient Data (CSV)",
+        data=csv,
+        file_name=f"patient_data_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv"
+    )
+    
+    # Search functionality
+    st.markdown("---")
+    st.subheader("🔍 Search Patient")
+    search_term = st.text_input("Search by Patient ID, Name, or Mobile")
+    
+    if search_term:
+        search_results = filtered_df[
+            (filtered_df['patient_id'].str.contains(search_term, case=False)) |
+            (filtered_df['registry_id'].str.contains(search_term, case=False)) |
+            (filtered_df['name'].str.contains(search_term, case=False)) |
+            (filtered_df['mobile'].str.contains(search_term, case=False))
+        ]
+        
+        if len(search_results) > 0:
+            st.success(f"Found {len(search_results)} matching patient(s)")
+            for idx, row in search_results.iterrows():
+                with st.expander(f"👤 {row['name']} - {row['patient_id']}"):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**Age:** {row['age']} years")
+                        st.write(f"**Gender:** {row['gender']}")
+                        st.write(f"**Blood Group:** {row['blood_group']}")
+                        st.write(f"**Mobile:** {row['mobile']}")
+                        st.write(f"**Email:** {row['email']}")
+                    with col2:
+                        st.write(f"**Department:** {row['department']}")
+                        st.write(f"**Doctor:** {row['doctor_name']}")
+                        st.write(f"**Date:** {row['appointment_date']}")
+                        st.write(f"**Time:** {row['appointment_time']}")
+                        st.write(f"**Room:** {row['doctor_room']}")
+                    
+                    st.write(f"**Symptoms:** {row['symptoms']}")
+                    st.write(f"**Lab Tests:** {row['lab_tests']}")
+                    st.markdown(f"**Total Billing:** ₹{row['total_billing']:,.2f}")
+        else:
+            st.warning("No patients found matching your search")
@@ -0,0 +1,102 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from admin_data import rollup
+
+
+# ==================== REVENUE ANALYTICS PAGE ====================
+def render():
+    st.header("💰 Revenue Analytics")
+    
+    # Revenue per doctor and day, merged from the branch partials; the date
+    # filter and every breakdown below work on this small table
+    daily = rollup('daily_revenue', ['appointment_date', 'department', 'doctor_name'], {
+        'patient_id': 'count',
+        'total_billing': 'sum',
+        'consultation_fee': 'sum',
+        'lab_cost': 'sum'
+    }, partition_by='month')
+    
+    # Date filter
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", daily['appointment_date'].min())
+    with col2:
+        end_date = st.date_input("End Date", daily['appointment_date'].max())
+    
+    filtered_df = daily[(daily['appointment_date'] >= start_date) & (daily['appointment_date'] <= end_date)]
+    appointments = filtered_df['patient_id'].sum()
+    
+    # Revenue Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Revenue", f"₹{filtered_df['total_billing'].sum():,.0f}")
+    with col2:
+        st.metric("Consultation Revenue", f"₹{filtered_df['consultation_fee'].sum():,.0f}")
+    with col3:
+        st.metric("Lab Revenue", f"₹{filtered_df['lab_cost'].sum():,.0f}")
+    with col4:
+        avg_revenue = filtered_df['total_billing'].sum() / appointments if appointments else 0
+        st.metric("Avg Revenue/Patient", f"₹{avg_revenue:,.0f}")
+    
+    st.markdown("---")
+    
+    # Revenue Breakdown
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Revenue Composition")
+        revenue_comp = pd.DataFrame({
+            'Type': ['Consultation Fees', 'Lab Tests'],
+            'Amount': [filtered_df['consultation_fee'].sum(), filtered_df['lab_cost'].sum()]
+        })
+        fig = px.pie(revenue_comp, values='Amount', names='Type', 
+                     color_discrete_sequence=['#FF6B6B', '#4ECDC4'])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Revenue by Department")
+        dept_revenue = filtered_df.groupby('department')['total_billing'].sum().sort_values(ascending=True)
+        fig = px.bar(x=dept_revenue.values, y=dept_revenue.index, orientation='h',
+                     labels={'x': 'Revenue (₹)', 'y': 'Department'})
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Time-based Revenue Analysis
+    st.subheader("📅 Revenue Trends")
+    
+    period = st.radio("Select Period", ["Daily", "Weekly", "Monthly", "Quarterly"], horizontal=True)
+    dates = pd.to_datetime(filtered_df['appointment_date'])
+    
+    if period == "Daily":
+        time_revenue = filtered_df.groupby('appointment_date')['total_billing'].sum().reset_index()
+        time_revenue.columns = ['Date', 'Revenue']
+        fig = px.line(time_revenue, x='Date', y='Revenue', markers=True)
+    elif period == "Weekly":
+        time_revenue = filtered_df.groupby(dates.dt.isocalendar().week)['total_billing'].sum().reset_index()
+        time_revenue.columns = ['Week', 'Revenue']
+        fig = px.bar(time_revenue, x='Week', y='Revenue')
+    elif period == "Monthly":
+        time_revenue = filtered_df.groupby(dates.dt.strftime('%B'))['total_billing'].sum().reset_index()
+        time_revenue.columns = ['Month', 'Revenue']
+        month_order = ['January', 'February', 'March', 'April', 'May', 'June', 
+                       'July', 'August', 'September', 'October', 'November', 'December']
+        time_revenue['Month'] = pd.Categorical(time_revenue['Month'], categories=month_order, ordered=True)
+        time_revenue = time_revenue.sort_values('Month')
+        fig = px.bar(time_revenue, x='Month', y='Revenue', color='Revenue')
+    else:  # Quarterly
+        time_revenue = filtered_df.groupby("Q" + dates.dt.quarter.astype(str))['total_billing'].sum().reset_index()
+        time_revenue.columns = ['Quarter', 'Revenue']
+        fig = px.bar(time_revenue, x='Quarter', y='Revenue', color='Revenue')
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Doctor-wise Revenue
+    st.subheader("👨‍⚕️ Revenue by Doctor")
+    doctor_revenue = filtered_df.groupby(['doctor_name', 'department'])['total_billing'].sum().reset_index()
+    doctor_revenue = doctor_revenue.sort_values('total_billing', ascending=False).head(10)
+    
+    fig = px.bar(doctor_revenue, x='doctor_name', y='total_billing', color='department',
+                 labels={'doctor_name': 'Doctor', 'total_billing': 'Revenue (₹)'})
+    fig.update_layout(xaxis_tickangle=-45)
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,120 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from admin_data import (DISTRIBUTION_FORMAT, analytics_mode, daily_prefix, dataset_moments, distribution_stats, rollup,
+                        rollup_counts)
+from aggregation import month_key
+from rolling import WINDOWS
+
+
+# ==================== TREND ANALYSIS PAGE ====================
+def render():
+    st.header("📈 Trend Analysis")
+    
+    monthly_metrics = rollup('monthly_metrics', 'month_key', {
+        'patient_id': 'count',
+        'total_billing': 'sum',
+        'consultation_fee': 'mean',
+        'num_lab_tests': 'mean'
+    }, partition_by='month', prepare=lambda frame: frame.assign(month_key=month_key(frame)))
+    monthly_metrics.columns = ['Month', 'Patients', 'Revenue', 'Avg Consultation', 'Avg Lab Tests']
+    
+    # Patient Growth Trend
+    st.subheader("Patient Volume Trend")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=monthly_metrics['Month'], y=monthly_metrics['Patients'],
+                            mode='lines+markers', name='Patients',
+                            line=dict(color='#FF6B6B', width=3)))
+    fig.update_layout(title='Monthly Patient Trend', xaxis_title='Month', yaxis_title='Number of Patients')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Multi-metric comparison
+    st.subheader("Multi-Metric Monthly Comparison")
+    fig = make_subplots(rows=2, cols=2,
+                        subplot_titles=('Patients', 'Revenue', 'Avg Consultation Fee', 'Avg Lab Tests'))
+    
+    fig.add_trace(go.Bar(x=monthly_metrics['Month'], y=monthly_metrics['Patients'], name='Patients'),
+                  row=1, col=1)
+    fig.add_trace(go.Bar(x=monthly_metrics['Month'], y=monthly_metrics['Revenue'], name='Revenue'),
+                  row=1, col=2)
+    fig.add_trace(go.Scatter(x=monthly_metrics['Month'], y=monthly_metrics['Avg Consultation'], 
+                            mode='lines+markers', name='Avg Consultation'),
+                  row=2, col=1)
+    fig.add_trace(go.Scatter(x=monthly_metrics['Month'], y=monthly_metrics['Avg Lab Tests'], 
+                            mode='lines+markers', name='Avg Lab Tests'),
+                  row=2, col=2)
+    
+    fig.update_layout(height=600, showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader(f"Monthly Billing Distribution ({analytics_mode()})")
+    dist_stats = distribution_stats('month_key').rename(columns={'Key': 'Month'})
+    st.dataframe(dist_stats.style.format(DISTRIBUTION_FORMAT), use_container_width=True)
+    
+    # Rolling windows, read from the per-day prefix sums
+    st.subheader("Rolling Windows")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        group = st.radio("Group By", ['Department', 'Doctor'], horizontal=True, key="rolling_group")
+    with col2:
+        window = st.selectbox("Window", WINDOWS, format_func=lambda w: f"{w} days", key="rolling_window")
+    with col3:
+        metric = st.selectbox("Metric", ['Patient Volume', 'Revenue', 'Avg Consultation Fee'], key="rolling_metric")
+    
+    prefix = daily_prefix('department' if group == 'Department' else 'doctor_name')
+    series = prefix.frame(window, {'Patient Volume': 'volume', 'Revenue': 'revenue',
+                                   'Avg Consultation Fee': 'avg_fee'}[metric])
+    fig = px.line(series, x='Date', y='Value', color='Entity',
+                  labels={'Value': f"{metric} ({window}-day)", 'Entity': group})
+    st.plotly_chart(fig, use_container_width=True)
+    
+    latest = prefix.latest(window).rename(columns={
+        'Entity': group,
+        'Volume': f'Patients ({window}d)',
+        'Revenue': f'Revenue ({window}d)',
+        'Avg Fee': f'Avg Fee ({window}d)'
+    })
+    st.dataframe(latest.style.format({
+        f'Patients ({window}d)': '{:,.0f}',
+        f'Revenue ({window}d)': '₹{:,.0f}',
+        f'Avg Fee ({window}d)': '₹{:,.0f}',
+        'Volume WoW': '{:+.1%}',
+        'Revenue WoW': '{:+.1%}'
+    }, na_rep='—'), use_container_width=True)
+    
+    # Day of Week Analysis
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Busiest Days of Week")
+        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        day_counts = rollup_counts('day_of_week_counts', 'day_of_week').reindex(day_order, fill_value=0)
+        fig = px.bar(x=day_counts.index, y=day_counts.values,
+                     labels={'x': 'Day', 'y': 'Patients'},
+                     color=day_counts.values, color_continuous_scale='Blues')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Peak Time Slots")
+        time_counts = rollup_counts('time_slot_counts', 'appointment_time')
+        fig = px.bar(x=time_counts.index, y=time_counts.values,
+                     labels={'x': 'Time Slot', 'y': 'Patients'},
+                     color=time_counts.values, color_continuous_scale='Reds')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Correlation Analysis (read from the streaming moment accumulator)
+    moments = dataset_moments()
+    
+    st.subheader("Correlation Heatmap")
+    corr_matrix = moments.correlation()
+    
+    fig = px.imshow(corr_matrix, text_auto='.2f', aspect='auto',
+                    color_continuous_scale='RdBu_r')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("Summary Statistics")
+    summary = pd.DataFrame({'Mean': moments.means(), 'Std Dev': moments.std()})
+    st.dataframe(summary.style.format('{:,.2f}'), use_container_width=True)
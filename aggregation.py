@@ -0,0 +1,147 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Map-reduce aggregation engine for the admin dashboard.
+#
+# aggregate() splits the frame into partitions (by month or by department),
+# computes mergeable partial aggregates for each partition in a process pool
+# and merges them. `by` is a column or a list of columns, and the result
+# matches df.groupby(by).agg(spec).reset_index() for the supported operations:
+#
+#   count, sum   -> kept as partial counts / sums
+#   mean         -> sum and count, divided at the end
+#   var, std     -> count, mean and M2 (sum of squared deviations), merged
+#                   with Chan's pairwise formula so no precision is lost
+#   first        -> first value seen, in partition order
+#
+# Small frames skip the pool entirely; pickling partitions to worker
+# processes only pays off once there is real work to split.
+#
+# aggregate_partial() stops before finalize(), so callers can keep one
+# merged partial per shard (e.g. per hospital branch) and combine shards
+# later with merge_partials() instead of re-reading their rows.
+
+SUPPORTED_OPS = ("count", "sum", "mean", "var", "std", "first")
+PARALLEL_MIN_ROWS = 200_000
+MAX_WORKERS = os.cpu_count() or 1
+
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _pool
+
+
+def month_key(df):
+    return pd.to_datetime(df['appointment_date']).dt.strftime('%Y-%m')
+
+
+def _partial_columns(col, op):
+    if op == "count":
+        return [f"{col}|count"]
+    if op == "sum":
+        return [f"{col}|sum"]
+    if op == "mean":
+        return [f"{col}|count", f"{col}|sum"]
+    if op in ("var", "std"):
+        return [f"{col}|count", f"{col}|mean", f"{col}|m2"]
+    return [f"{col}|first"]
+
+
+def partial_aggregate(frame, by, spec):
+    grouped = frame.groupby(by, sort=False)
+    partial = {}
+    for col, op in spec.items():
+        for name in _partial_columns(col, op):
+            if name in partial:
+                continue
+            stat = name.rsplit("|", 1)[1]
+            if stat == "count":
+                partial[name] = grouped[col].count()
+            elif stat == "sum":
+                partial[name] = grouped[col].sum()
+            elif stat == "mean":
+                partial[name] = grouped[col].mean()
+            elif stat == "m2":
+                partial[name] = grouped[col].var(ddof=0) * grouped[col].count()
+            else:
+                partial[name] = grouped[col].first()
+    return pd.DataFrame(partial)
+
+
+def merge_partials(partials):
+    combined = pd.concat(partials)
+    levels = list(range(combined.index.nlevels))
+    grouped = combined.groupby(level=levels, sort=True)
+    merged = {}
+    for name in combined.columns:
+        col, stat = name.rsplit("|", 1)
+        if stat in ("count", "sum"):
+            merged[name] = grouped[name].sum()
+        elif stat == "first":
+            merged[name] = grouped[name].first()
+
+    for name in combined.columns:
+        col, stat = name.rsplit("|", 1)
+        if stat != "mean":
+            continue
+        counts = combined[f"{col}|count"]
+        means = combined[name].fillna(0)
+        total = merged[f"{col}|count"]
+        mean = (counts * means).groupby(level=levels, sort=True).sum() / total.replace(0, np.nan)
+        # Chan et al.: M2 = sum(M2_i) + sum(n_i * (mean_i - mean)^2)
+        delta = means - mean.reindex(combined.index).to_numpy()
+        spread = (counts * delta ** 2).groupby(level=levels, sort=True).sum()
+        merged[name] = mean
+        merged[f"{col}|m2"] = grouped[f"{col}|m2"].sum() + spread
+
+    result = pd.DataFrame(merged)
+    result.index.names = combined.index.names
+    return result
+
+
+def finalize(merged, by, spec):
+    result = pd.DataFrame(index=merged.index)
+    for col, op in spec.items():
+        if op in ("count", "sum"):
+            result[col] = merged[f"{col}|{op}"]
+        elif op == "mean":
+            result[col] = merged[f"{col}|sum"] / merged[f"{col}|count"].replace(0, np.nan)
+        elif op in ("var", "std"):
+            variance = merged[f"{col}|m2"] / (merged[f"{col}|count"] - 1).where(lambda n: n > 0)
+            result[col] = np.sqrt(variance) if op == "std" else variance
+        else:
+            result[col] = merged[f"{col}|first"]
+    result.index.names = by if isinstance(by, list) else [by]
+    return result.reset_index()
+
+
+def partition(df, partition_by):
+    keys = month_key(df) if partition_by == "month" else df[partition_by]
+    return [frame for _, frame in df.groupby(keys, sort=True)]
+
+
+def aggregate_partial(df, by, spec, partition_by="month"):
+    for col, op in spec.items():
+        if op not in SUPPORTED_OPS:
+            raise ValueError(f"Unsupported aggregation '{op}' for column '{col}'")
+
+    if len(df) < PARALLEL_MIN_ROWS or MAX_WORKERS < 2:
+        partials = [partial_aggregate(df, by, spec)]
+    else:
+        parts = partition(df, partition_by)
+        pool = _get_pool()
+        futures = [pool.submit(partial_aggregate, part, by, spec) for part in parts]
+        partials = [future.result() for future in futures]
+
+    return merge_partials(partials)
+
+
+def aggregate(df, by, spec, partition_by="month"):
+    return finalize(aggregate_partial(df, by, spec, partition_by), by, spec)
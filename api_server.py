@@ -0,0 +1,468 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from admin_data import NUM_PATIENTS, catalog, dataset_fingerprint, load_branch_frame
+from aggregation import aggregate_partial, finalize, merge_partials
+
+# Local HTTP/JSON query API over the admin analytics.
+#
+#   GET /                    endpoints and the current data version
+#   GET /branches            branch list
+#   GET /doctors             doctor stats            ?branch=
+#   GET /departments         department stats        ?branch=
+#   GET /revenue             revenue by period       ?branch= &period=daily|weekly|monthly|quarterly
+#                                                    &start=YYYY-MM-DD &end=YYYY-MM-DD
+#   GET /patients            filtered appointments   ?branch= &department= &doctor= &gender=
+#                                                    &patient_type= &blood_group= &q= &start= &end=
+#                                                    &page= &page_size=
+#
+# One asyncio process serves every client. Per branch, the aggregate
+# partials, a daily revenue table and value -> rows indexes for the patient
+# filters are built once per data version (the dataset fingerprints); a
+# request merges or slices those instead of grouping the rows again.
+# Responses are cached by (version, path, query) and carry an ETag derived
+# from the same key, so a client revalidating with If-None-Match gets a 304
+# without any work. Bodies are gzipped when the client accepts it, and
+# patient pages are streamed with chunked transfer encoding.
+#
+#   python api_server.py --port 8765
+#   curl -s --compressed 'http://127.0.0.1:8765/patients?department=Cardiology&page_size=20'
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+REFRESH_SECONDS = 60
+CACHE_ENTRIES = 256
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_ROWS = 200
+GZIP_MIN_BYTES = 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+DOCTOR_SPEC = {
+    'patient_id': 'count',
+    'total_billing': 'sum',
+    'consultation_fee': 'mean',
+    'department': 'first',
+    'doctor_experience': 'first'
+}
+DEPARTMENT_SPEC = {
+    'patient_id': 'count',
+    'total_billing': 'sum',
+    'consultation_fee': 'mean',
+    'lab_cost': 'sum',
+    'num_lab_tests': 'mean'
+}
+PERIODS = {'daily': 'D', 'weekly': 'W-MON', 'monthly': 'MS', 'quarterly': 'QS'}
+
+# Query parameter -> column for the exact-match patient filters
+PATIENT_FILTERS = {
+    'department': 'department',
+    'doctor': 'doctor_name',
+    'gender': 'gender',
+    'patient_type': 'patient_type',
+    'blood_group': 'blood_group',
+}
+PATIENT_COLUMNS = [
+    'patient_id', 'registry_id', 'branch', 'name', 'age', 'gender', 'blood_group',
+    'department', 'doctor_name', 'appointment_date', 'appointment_time', 'patient_type',
+    'symptoms', 'lab_tests', 'consultation_fee', 'lab_cost', 'total_billing'
+]
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    return json.dumps(payload, default=_json_default, separators=(",", ":"))
+
+
+def _iso_dates(frame):
+    # Dates as plain YYYY-MM-DD rather than to_json's timestamps
+    frame = frame.copy()
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.strftime('%Y-%m-%d')
+        elif len(frame) and isinstance(frame[col].iloc[0], date):
+            frame[col] = frame[col].map(date.isoformat)
+    return frame
+
+
+def _records(frame):
+    # to_json takes care of NaN and numpy types
+    return json.loads(_iso_dates(frame).to_json(orient="records"))
+
+
+def _parse_date(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be a date (YYYY-MM-DD)")
+
+
+def _parse_int(params, name, default, low, high):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an integer")
+    if not low <= value <= high:
+        raise ApiError(400, f"'{name}' must be between {low} and {high}")
+    return value
+
+
+class BranchShard:
+    def __init__(self, branch, df):
+        self.branch = branch
+        self.df = df.reset_index(drop=True)
+        self.doctor_partial = aggregate_partial(self.df, 'doctor_name', DOCTOR_SPEC, 'department')
+        self.department_partial = aggregate_partial(self.df, 'department', DEPARTMENT_SPEC, 'month')
+        self.dates = pd.to_datetime(self.df['appointment_date']).to_numpy()
+        self.daily = self.df.groupby(self.dates).agg(
+            appointments=('patient_id', 'count'),
+            consultation_revenue=('consultation_fee', 'sum'),
+            lab_revenue=('lab_cost', 'sum'),
+            total_revenue=('total_billing', 'sum')
+        )
+        # value -> row positions, so exact-match filters are dict lookups
+        self.index = {col: self.df.groupby(col).indices for col in PATIENT_FILTERS.values()}
+        self.search_text = (self.df['patient_id'] + " " + self.df['registry_id'] + " " +
+                            self.df['name'] + " " + self.df['mobile'].astype(str)).str.lower()
+        # Every row encoded once, so a page is a join of ready-made JSON
+        lines = _iso_dates(self.df[PATIENT_COLUMNS]).to_json(orient="records", lines=True)
+        self.rows = np.array(lines.encode().splitlines(), dtype=object)
+
+    def search(self, filters, q, start, end):
+        positions = None
+        for col, value in filters.items():
+            rows = self.index[col].get(value, np.empty(0, dtype=int))
+            positions = rows if positions is None else np.intersect1d(positions, rows, assume_unique=True)
+        if positions is None:
+            positions = np.arange(len(self.df))
+        if start is not None:
+            positions = positions[self.dates[positions] >= np.datetime64(start)]
+        if end is not None:
+            positions = positions[self.dates[positions] <= np.datetime64(end)]
+        if q:
+            matches = self.search_text.iloc[positions].str.contains(q.lower(), regex=False).to_numpy()
+            positions = positions[matches]
+        return np.sort(positions)
+
+
+class QueryEngine:
+    def __init__(self, num_patients=NUM_PATIENTS, cache_entries=CACHE_ENTRIES):
+        self.num_patients = num_patients
+        self.cache_entries = cache_entries
+        self.version = None
+        self.shards = {}
+        self.responses = OrderedDict()
+        self.searches = OrderedDict()
+        # Cache misses run in worker threads; one lock keeps the LRU caches
+        # consistent and stops two threads building the same entry
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        fingerprints = [dataset_fingerprint(self.num_patients, b.id) for b in catalog.branches]
+        version = hashlib.sha256("|".join(fingerprints).encode()).hexdigest()[:16]
+        if version != self.version:
+            shards = {b.name: BranchShard(b, load_branch_frame(self.num_patients, b.id)) for b in catalog.branches}
+            with self._lock:
+                self.shards, self.version = shards, version
+                self.responses.clear()
+                self.searches.clear()
+        return self.version
+
+    def _cache(self, cache, key, build):
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            value = cache[key] = build()
+            if len(cache) > self.cache_entries:
+                cache.popitem(last=False)
+            return value
+
+    def select(self, branch):
+        if not branch:
+            return list(self.shards.values())
+        if branch not in self.shards:
+            raise ApiError(400, f"Unknown branch '{branch}'")
+        return [self.shards[branch]]
+
+    def etag(self, path, params):
+        key = f"{self.version}|{path}|{urlencode(sorted(params.items()))}"
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+    def response(self, path, params, build):
+        # Cached JSON body for (version, path, query), with its gzip variant
+        def render():
+            body = dumps(build(params)).encode()
+            return {'body': body, 'gzip': None}
+        return self._cache(self.responses, (self.version, path, tuple(sorted(params.items()))), render)
+
+    # Endpoints
+    def index(self, params):
+        return {'version': self.version, 'endpoints': ['/branches', '/doctors', '/departments', '/revenue', '/patients']}
+
+    def branches(self, params):
+        return [{'name': s.branch.name, 'code': s.branch.code, 'appointments': len(s.df)} for s in self.shards.values()]
+
+    def doctors(self, params):
+        shards = self.select(params.get('branch'))
+        stats = finalize(merge_partials([s.doctor_partial for s in shards]), 'doctor_name', DOCTOR_SPEC)
+        stats = stats.rename(columns={'patient_id': 'patients', 'total_billing': 'total_revenue',
+                                      'consultation_fee': 'avg_consultation_fee', 'doctor_experience': 'experience'})
+        return _records(stats.sort_values('patients', ascending=False))
+
+    def departments(self, params):
+        shards = self.select(params.get('branch'))
+        stats = finalize(merge_partials([s.department_partial for s in shards]), 'department', DEPARTMENT_SPEC)
+        stats = stats.rename(columns={'patient_id': 'patients', 'total_billing': 'total_revenue',
+                                      'consultation_fee': 'avg_consultation_fee', 'lab_cost': 'lab_revenue',
+                                      'num_lab_tests': 'avg_lab_tests'})
+        return _records(stats)
+
+    def revenue(self, params):
+        shards = self.select(params.get('branch'))
+        period = params.get('period', 'monthly')
+        if period not in PERIODS:
+            raise ApiError(400, f"'period' must be one of {', '.join(PERIODS)}")
+        start, end = _parse_date(params, 'start'), _parse_date(params, 'end')
+        daily = shards[0].daily
+        for shard in shards[1:]:
+            daily = daily.add(shard.daily, fill_value=0)
+        if start:
+            daily = daily[daily.index >= pd.Timestamp(start)]
+        if end:
+            daily = daily[daily.index <= pd.Timestamp(end)]
+        totals = daily.resample(PERIODS[period]).sum()
+        totals['appointments'] = totals['appointments'].astype(int)
+        totals['avg_revenue_per_patient'] = totals['total_revenue'] / totals['appointments'].replace(0, np.nan)
+        totals.index = totals.index.date
+        totals.index.name = 'period'
+        return _records(totals.reset_index())
+
+    def search(self, params):
+        # Matching rows per shard, cached by (version, filters) so paging
+        # through a result set filters once
+        shards = self.select(params.get('branch'))
+        filters = {col: params[name] for name, col in PATIENT_FILTERS.items() if params.get(name)}
+        q = params.get('q', '').strip()
+        start, end = _parse_date(params, 'start'), _parse_date(params, 'end')
+        key = (self.version, params.get('branch'), tuple(sorted(filters.items())), q, start, end)
+        return self._cache(self.searches, key,
+                           lambda: [(shard, shard.search(filters, q, start, end)) for shard in shards])
+
+    def patient_page(self, params, path):
+        page = _parse_int(params, 'page', 1, 1, 10 ** 9)
+        page_size = _parse_int(params, 'page_size', PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        results = self.search(params)
+        total = sum(len(positions) for _, positions in results)
+        pages = max(1, -(-total // page_size))
+        begin, end = (page - 1) * page_size, page * page_size
+        next_url = f"{path}?{urlencode({**params, 'page': page + 1})}" if end < total else None
+        header = {'version': self.version, 'page': page, 'page_size': page_size,
+                  'total': total, 'pages': pages, 'next': next_url}
+
+        def chunks():
+            # {"page": ..., "items": [ rows streamed STREAM_ROWS at a time ]}
+            yield dumps(header)[:-1].encode() + b',"items":['
+            offset, first = 0, True
+            for shard, positions in results:
+                lo, hi = max(begin - offset, 0), min(end - offset, len(positions))
+                offset += len(positions)
+                for i in range(lo, hi, STREAM_ROWS):
+                    body = b",".join(shard.rows[positions[i:min(i + STREAM_ROWS, hi)]])
+                    yield body if first else b"," + body
+                    first = False
+            yield b"]}"
+        return chunks()
+
+
+class ApiServer:
+    def __init__(self, engine, refresh_seconds=REFRESH_SECONDS):
+        self.engine = engine
+        self.refresh_seconds = refresh_seconds
+        self.routes = {
+            '/': engine.index,
+            '/branches': engine.branches,
+            '/doctors': engine.doctors,
+            '/departments': engine.departments,
+            '/revenue': engine.revenue,
+        }
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        await asyncio.to_thread(self.engine.refresh)
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        refresher = asyncio.create_task(self._refresh_loop())
+        print(f"Serving on http://{host}:{port} (data version {self.engine.version})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
+
+    async def _refresh_loop(self):
+        # Picks up a new data version (new day, changed code or catalog)
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await asyncio.to_thread(self.engine.refresh)
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise ApiError(400, "Request headers too large")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise ApiError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ApiError as error:
+                    await self._send(writer, error.status, dumps({'error': error.message}).encode(), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._dispatch(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, writer, method, target, headers, keep_alive):
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        head = method == "HEAD"
+        gzip_ok = "gzip" in headers.get('accept-encoding', '')
+        try:
+            if method not in ("GET", "HEAD"):
+                raise ApiError(405, "Only GET and HEAD are supported")
+            if url.path != '/patients' and url.path not in self.routes:
+                raise ApiError(404, f"No endpoint {url.path}")
+
+            etag = self.engine.etag(url.path, params)
+            if etag in headers.get('if-none-match', ''):
+                await self._send(writer, 304, b"", etag=etag, keep_alive=keep_alive)
+                return
+
+            if url.path == '/patients':
+                chunks = await asyncio.to_thread(self.engine.patient_page, params, url.path)
+                await self._stream(writer, chunks, etag, gzip_ok, head, keep_alive)
+                return
+
+            entry = await asyncio.to_thread(self.engine.response, url.path, params, self.routes[url.path])
+            body, encoding = entry['body'], None
+            if gzip_ok and len(body) >= GZIP_MIN_BYTES:
+                if entry['gzip'] is None:
+                    entry['gzip'] = _gzip(body)
+                body, encoding = entry['gzip'], "gzip"
+            await self._send(writer, 200, body, etag=etag, encoding=encoding, head=head, keep_alive=keep_alive)
+        except ApiError as error:
+            await self._send(writer, error.status, dumps({'error': error.message}).encode(), keep_alive=keep_alive)
+        except Exception as error:
+            await self._send(writer, 500, dumps({'error': str(error)}).encode(), keep_alive=keep_alive)
+
+    def _head(self, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer, status, body, etag=None, encoding=None, head=False, keep_alive=True):
+        headers = {'Content-Type': 'application/json', 'Content-Length': str(len(body)), 'Vary': 'Accept-Encoding'}
+        if etag:
+            headers['ETag'] = etag
+            headers['Cache-Control'] = 'no-cache'
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        writer.write(self._head(status, headers, keep_alive) + (b"" if head else body))
+        await writer.drain()
+
+    async def _stream(self, writer, chunks, etag, gzip_ok, head, keep_alive):
+        headers = {'Content-Type': 'application/json', 'Transfer-Encoding': 'chunked',
+                   'Vary': 'Accept-Encoding', 'ETag': etag, 'Cache-Control': 'no-cache'}
+        if gzip_ok:
+            headers['Content-Encoding'] = 'gzip'
+        writer.write(self._head(200, headers, keep_alive))
+        if head:
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            return
+        compressor = zlib.compressobj(wbits=31) if gzip_ok else None
+        for chunk in chunks:
+            data = compressor.compress(chunk) if compressor else chunk
+            if data:
+                writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                await writer.drain()
+        if compressor:
+            data = compressor.flush()
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def _gzip(body):
+    compressor = zlib.compressobj(wbits=31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API over the admin analytics")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to bind")
+    parser.add_argument("--patients", type=int, default=NUM_PATIENTS, help="generated appointments per branch")
+    args = parser.parse_args()
+    try:
+        asyncio.run(ApiServer(QueryEngine(args.patients)).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import date
+from pathlib import Path
+
+from catalog import get_catalog
+
+# Compact, bounded appointment history for health_app.py sessions.
+#
+# AppointmentRecord keeps one booking in __slots__ with dates as ordinals,
+# departments, doctors, symptoms and lab tests as catalog IDs and the other
+# repeated strings (slot, gender, ...) as small interned integers, instead
+# of a full copy of patient_data.
+# AppointmentLog holds only the most recent records in memory; older ones
+# are spilled to a JSON-lines file so a session stays flat over a shift.
+
+# Runtime data (spool, outbox, feed, registry, caches). HOSPITAL_DATA_DIR
+# points a process at another tree, e.g. load_test.py's temp directory.
+DATA_DIR = Path(os.environ.get("HOSPITAL_DATA_DIR") or Path(__file__).resolve().parent / "data")
+SPILL_DIR = DATA_DIR / "appointments"
+
+
+class InternTable:
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._lock = threading.Lock()
+
+    def id(self, name):
+        key = self._ids.get(name)
+        if key is None:
+            # Sessions run in threads; two of them interning the same new
+            # name must not hand out two IDs for it
+            with self._lock:
+                key = self._ids.get(name)
+                if key is None:
+                    key = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = key
+        return key
+
+    def name(self, key):
+        return self._names[key]
+
+
+# Shared by every session in the process
+names = InternTable()
+
+
+class AppointmentRecord:
+    __slots__ = (
+        'booked_at', 'appointment_day', 'time_slot', 'dept_id', 'doctor_id',
+        'patient_id', 'patient_type', 'name', 'age', 'gender', 'blood_group', 'dob_day',
+        'mobile', 'email', 'symptom_ids', 'lab_test_ids',
+        'consultation_fee', 'lab_cost', 'total_billing'
+    )
+
+    def __init__(self, patient_data, time_slot, appointment_date, patient_type,
+                 consultation_fee, total_billing, booked_at=None):
+        self.booked_at = booked_at or time.time()
+        self.appointment_day = appointment_date.toordinal()
+        self.time_slot = names.id(time_slot)
+        catalog = get_catalog()
+        self.dept_id = catalog.department(patient_data['department']).id
+        self.doctor_id = patient_data['doctor_id']
+        self.patient_id = patient_data.get('patient_id')
+        self.patient_type = names.id(patient_type)
+        self.name = patient_data['name']
+        self.age = patient_data['age']
+        self.gender = names.id(patient_data['gender'])
+        self.blood_group = names.id(patient_data['blood_group'])
+        self.dob_day = patient_data['dob'].toordinal()
+        self.mobile = patient_data['mobile']
+        self.email = patient_data['email']
+        self.symptom_ids = tuple(catalog.symptom_by_name[s].id for s in patient_data['symptoms'])
+        self.lab_test_ids = tuple(catalog.lab_test_by_name[t].id for t in patient_data['lab_tests'])
+        self.consultation_fee = consultation_fee
+        self.lab_cost = patient_data['lab_cost']
+        self.total_billing = total_billing
+
+    @property
+    def department(self):
+        return get_catalog().departments[self.dept_id].name
+
+    @property
+    def doctor_name(self):
+        return get_catalog().doctors[self.doctor_id].name
+
+    def to_dict(self):
+        catalog = get_catalog()
+        return {
+            'booked_at': self.booked_at,
+            'appointment_date': date.fromordinal(self.appointment_day).isoformat(),
+            'time_slot': names.name(self.time_slot),
+            'department': self.department,
+            'doctor_id': self.doctor_id,
+            'doctor_name': self.doctor_name,
+            'patient_id': self.patient_id,
+            'patient_type': names.name(self.patient_type),
+            'name': self.name,
+            'age': self.age,
+            'gender': names.name(self.gender),
+            'blood_group': names.name(self.blood_group),
+            'dob': date.fromordinal(self.dob_day).isoformat(),
+            'mobile': self.mobile,
+            'email': self.email,
+            'symptoms': [catalog.symptoms[s].name for s in self.symptom_ids],
+            'lab_tests': [catalog.lab_tests[t].name for t in self.lab_test_ids],
+            'consultation_fee': self.consultation_fee,
+            'lab_cost': self.lab_cost,
+            'total_billing': self.total_billing,
+        }
+
+
+class AppointmentLog:
+    def __init__(self, capacity=200, spill_batch=50, spill_path=None):
+        self.capacity = capacity
+        self.spill_batch = min(spill_batch, capacity)
+        self.spill_path = Path(spill_path) if spill_path else SPILL_DIR / f"session-{uuid.uuid4().hex}.jsonl"
+        self.recent = deque()
+        self.total = 0
+        self.spilled = 0
+
+    def append(self, record):
+        if len(self.recent) >= self.capacity:
+            self._spill()
+        self.recent.append(record)
+        self.total += 1
+
+    def _spill(self):
+        # Write the oldest records in one batch to keep file I/O rare
+        batch = [self.recent.popleft() for _ in range(self.spill_batch)]
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for record in batch:
+                f.write(json.dumps(record.to_dict()) + "\n")
+        self.spilled += len(batch)
+
+    def __len__(self):
+        return self.total
+
+    def iter_dicts(self):
+        if self.spilled:
+            with open(self.spill_path, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        for record in self.recent:
+            yield record.to_dict()
@@ -0,0 +1,150 @@
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from catalog import get_catalog
+from live_feed import read_feed
+
+# Doctor availability for the booking desk.
+#
+# Occupancy is one uint8 array of shape (doctors, days, slots) covering a
+# rolling horizon that starts today. Booking flips a single cell, and every
+# query is a vectorized scan over a slice of the array, so even hundreds of
+# doctors over 90 days (a few hundred KB) answer in well under a millisecond:
+#
+#   next_free(doctor, n)        next n free slots for one doctor
+#   earliest_in_department(ids) first free slot across a department
+#   free_on(day)                every free (doctor, slot) on one day
+#
+# One instance per branch is shared by all sessions in the process
+# (get_availability()), seeded from the bookings already in the live feed so
+# a restart does not reopen taken slots. Every method runs under one lock and
+# first moves the window to today, so a read never sees a half-rolled array
+# and two receptionists cannot take the same slot.
+
+HORIZON_DAYS = 90
+
+
+def slot_start(slot):
+    return datetime.strptime(slot, "%I:%M %p").time()
+
+
+class AvailabilityMatrix:
+    def __init__(self, num_doctors, time_slots, horizon_days=HORIZON_DAYS, today=None):
+        self.time_slots = tuple(time_slots)
+        self.slot_index = {slot: i for i, slot in enumerate(self.time_slots)}
+        self.slot_starts = [slot_start(slot) for slot in self.time_slots]
+        self.horizon_days = horizon_days
+        self.start = today or date.today()
+        self.occupied = np.zeros((num_doctors, horizon_days, len(self.time_slots)), dtype=np.uint8)
+        self._lock = threading.Lock()
+
+    def _roll(self, now=None):
+        # Move the window forward when the date changes
+        today = (now or datetime.now()).date()
+        shift = (today - self.start).days
+        if shift > 0:
+            self.occupied = np.roll(self.occupied, -shift, axis=1)
+            self.occupied[:, max(self.horizon_days - shift, 0):, :] = 0
+            self.start = today
+
+    def _first_open(self, now=None):
+        # Flat (day * slots + slot) offset of the first slot not yet started
+        now = now or datetime.now()
+        passed = sum(1 for start in self.slot_starts if start <= now.time())
+        return passed
+
+    def _to_slot(self, flat):
+        day, slot = divmod(int(flat), len(self.time_slots))
+        return self.start + timedelta(days=day), self.time_slots[slot]
+
+    def day_index(self, day):
+        index = (day - self.start).days
+        if not 0 <= index < self.horizon_days:
+            raise ValueError(f"{day} is outside the booking horizon")
+        return index
+
+    @property
+    def last_day(self):
+        with self._lock:
+            self._roll()
+            return self.start + timedelta(days=self.horizon_days - 1)
+
+    def is_free(self, doctor_id, day, slot):
+        with self._lock:
+            self._roll()
+            return not self.occupied[doctor_id, self.day_index(day), self.slot_index[slot]]
+
+    def book(self, doctor_id, day, slot):
+        with self._lock:
+            self._roll()
+            cell = (doctor_id, self.day_index(day), self.slot_index[slot])
+            if self.occupied[cell]:
+                return False
+            self.occupied[cell] = 1
+            return True
+
+    def release(self, doctor_id, day, slot):
+        with self._lock:
+            self._roll()
+            self.occupied[doctor_id, self.day_index(day), self.slot_index[slot]] = 0
+
+    def free_slots(self, doctor_id, day):
+        with self._lock:
+            self._roll()
+            index = self.day_index(day)
+            free = np.flatnonzero(self.occupied[doctor_id, index] == 0)
+            if index == 0:
+                free = free[free >= self._first_open()]
+            return [self.time_slots[i] for i in free]
+
+    def next_free(self, doctor_id, n=5):
+        with self._lock:
+            self._roll()
+            first = self._first_open()
+            flat = self.occupied[doctor_id].reshape(-1)[first:]
+            return [self._to_slot(first + i) for i in np.flatnonzero(flat == 0)[:n]]
+
+    def earliest_in_department(self, doctor_ids):
+        with self._lock:
+            self._roll()
+            first = self._first_open()
+            doctor_ids = np.asarray(doctor_ids)
+            free = self.occupied[doctor_ids].reshape(len(doctor_ids), -1)[:, first:] == 0
+            open_any = np.flatnonzero(free.any(axis=0))
+            if not len(open_any):
+                return None
+            offset = open_any[0]
+            doctor_id = int(doctor_ids[np.argmax(free[:, offset])])
+            return (doctor_id, *self._to_slot(first + offset))
+
+    def free_on(self, day):
+        with self._lock:
+            self._roll()
+            index = self.day_index(day)
+            free = self.occupied[:, index, :] == 0
+            if index == 0:
+                free[:, :self._first_open()] = False
+            doctors, slots = np.nonzero(free)
+            return [(int(d), self.time_slots[s]) for d, s in zip(doctors, slots)]
+
+    def free_count(self, day):
+        with self._lock:
+            self._roll()
+            index = self.day_index(day)
+            first = self._first_open() if index == 0 else 0
+            return int(np.count_nonzero(self.occupied[:, index, first:] == 0))
+
+
+@lru_cache(maxsize=None)
+def get_availability(branch):
+    catalog = get_catalog()
+    matrix = AvailabilityMatrix(len(catalog.doctors), catalog.time_slots)
+    # A booking is made at most HORIZON_DAYS ahead, so older feeds hold none still open
+    for record in read_feed(days=HORIZON_DAYS):
+        day = date.fromisoformat(record['appointment_date'])
+        if record.get('branch', branch) == branch and matrix.start <= day <= matrix.last_day:
+            matrix.book(catalog.doctor_of(record).id, day, record['time_slot'])
+    return matrix
@@ -0,0 +1,184 @@
+import argparse
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from appointment_store import DATA_DIR
+from catalog import get_catalog
+from notifications import OUTBOX_DIR
+
+# End-of-day (or end-of-month) billing run.
+#
+# Streams appointments from JSON-lines logs and CSV exports (main.py's
+# "Download Patient Data") in fixed-size chunks, keeps the rows inside the
+# date range and prices lab tests against the catalog in one matrix product
+# per chunk:
+#
+#   lab_cost = one_hot(lab_tests) @ catalog_prices
+#
+# The default source is the audit outbox (data/outbox/audit.jsonl), which the
+# side-effects worker appends to for every confirmed booking. Session spills
+# under data/appointments only hold what a session pushed out of memory, so
+# they are not a complete record on their own.
+#
+# Each patient gets one invoice for the period, keyed by their registry
+# identity (registry_id in exports, patient_id in booking logs) or, failing
+# that, their mobile number. Line items (one per appointment) are appended to
+# the output chunk by chunk; per-patient invoices and department settlement
+# totals are folded into running tables, so memory grows with the number of
+# patients billed, not the number of appointments.
+#
+#   python billing.py --start 2026-10-01 --end 2026-10-31
+#   python billing.py exports/*.csv --start 2026-10-01 --end 2026-10-31
+
+OUTPUT_DIR = DATA_DIR / "billing"
+AUDIT_PATH = OUTBOX_DIR / "audit.jsonl"
+CHUNK_SIZE = 50_000
+
+LINE_COLUMNS = [
+    'invoice_id', 'patient_key', 'appointment_date', 'name', 'mobile', 'email', 'department',
+    'doctor_name', 'lab_tests', 'consultation_fee', 'lab_cost', 'total_billing',
+    'unpriced_tests'
+]
+
+# How each per-patient invoice column folds across chunks
+INVOICE_AGG = {
+    'name': 'first', 'mobile': 'first', 'email': 'first',
+    'appointments': 'sum', 'first_visit': 'min', 'last_visit': 'max',
+    'consultation_fee': 'sum', 'lab_cost': 'sum', 'total_billing': 'sum', 'unpriced_tests': 'sum'
+}
+
+
+def read_chunks(path, chunksize=CHUNK_SIZE):
+    path = Path(path)
+    if path.suffix == ".csv":
+        return pd.read_csv(path, chunksize=chunksize, dtype={'mobile': str})
+    return pd.read_json(path, lines=True, chunksize=chunksize, dtype={'mobile': str})
+
+
+def normalize(chunk):
+    chunk = chunk.copy()
+    chunk['appointment_date'] = pd.to_datetime(chunk['appointment_date']).dt.normalize()
+    # CSV exports hold "X-ray, MRI" / "None"; appointment logs hold lists
+    tests = chunk['lab_tests']
+    chunk['lab_tests'] = tests.map(lambda t: ", ".join(t) if isinstance(t, list) else t)
+    chunk['lab_tests'] = chunk['lab_tests'].fillna("None").replace("", "None")
+    for col in ('mobile', 'email'):
+        if col not in chunk:
+            chunk[col] = ""
+    return chunk
+
+
+def patient_keys(chunk):
+    # Registry identity where the source has one, else the mobile number
+    key = pd.Series(None, index=chunk.index, dtype=object)
+    for col in ('registry_id', 'patient_id'):
+        if col in chunk and key.isna().any():
+            key = key.fillna(chunk[col].where(chunk[col].astype(str).str.strip() != ""))
+    mobile = chunk['mobile'].fillna("").astype(str).str.replace(r"\D", "", regex=True)
+    key = key.fillna("M" + mobile.where(mobile != ""))
+    return key.fillna("N-" + chunk['name'].astype(str).str.strip().str.lower())
+
+
+def price_lab_tests(lab_tests, catalog):
+    names = list(catalog)
+    prices = np.array([catalog[name] for name in names], dtype=float)
+    one_hot = lab_tests.str.get_dummies(sep=", ")
+    unknown = [col for col in one_hot.columns if col not in catalog and col != "None"]
+    lab_cost = one_hot.reindex(columns=names, fill_value=0).to_numpy(dtype=float) @ prices
+    unpriced = one_hot[unknown].sum(axis=1).to_numpy() if unknown else np.zeros(len(lab_tests), dtype=int)
+    return lab_cost, unpriced
+
+
+def run_billing(paths, start, end, catalog, output_dir=OUTPUT_DIR, chunksize=CHUNK_SIZE):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    invoices_path = output_dir / f"invoices_{start:%Y%m%d}_{end:%Y%m%d}.csv"
+    lines_path = output_dir / f"invoice_lines_{start:%Y%m%d}_{end:%Y%m%d}.csv"
+    settlement_path = output_dir / f"settlement_{start:%Y%m%d}_{end:%Y%m%d}.csv"
+    lines_path.unlink(missing_ok=True)
+
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    settlement = None
+    invoices = None
+    billed = 0
+
+    for path in paths:
+        for chunk in read_chunks(path, chunksize):
+            chunk = normalize(chunk)
+            chunk = chunk[(chunk['appointment_date'] >= start_ts) & (chunk['appointment_date'] <= end_ts)]
+            if chunk.empty:
+                continue
+
+            lab_cost, unpriced = price_lab_tests(chunk['lab_tests'], catalog)
+            keys = patient_keys(chunk)
+            lines = chunk.assign(
+                lab_cost=lab_cost,
+                unpriced_tests=unpriced,
+                total_billing=chunk['consultation_fee'].to_numpy(dtype=float) + lab_cost,
+                patient_key=keys,
+                invoice_id=f"INV-{start:%Y%m%d}-" + keys,
+                appointment_date=chunk['appointment_date'].dt.date
+            )[LINE_COLUMNS]
+            lines.to_csv(lines_path, mode="a", header=billed == 0, index=False)
+            billed += len(lines)
+
+            part = lines.groupby('department').agg(
+                appointments=('invoice_id', 'count'),
+                consultation_revenue=('consultation_fee', 'sum'),
+                lab_revenue=('lab_cost', 'sum'),
+                total_revenue=('total_billing', 'sum')
+            )
+            settlement = part if settlement is None else settlement.add(part, fill_value=0)
+
+            part = lines.assign(appointments=1, first_visit=lines['appointment_date'],
+                                last_visit=lines['appointment_date'])
+            part = part.groupby('invoice_id').agg(INVOICE_AGG)
+            invoices = part if invoices is None else pd.concat([invoices, part]).groupby(level=0).agg(INVOICE_AGG)
+
+    if not billed:
+        pd.DataFrame(columns=LINE_COLUMNS).to_csv(lines_path, index=False)
+
+    if invoices is None:
+        invoices = pd.DataFrame(columns=list(INVOICE_AGG))
+    invoices.index.name = 'invoice_id'
+    invoices.sort_index().to_csv(invoices_path)
+
+    if settlement is None:
+        settlement = pd.DataFrame(columns=['appointments', 'consultation_revenue', 'lab_revenue', 'total_revenue'])
+    settlement.index.name = 'department'
+    settlement = settlement.sort_index()
+    settlement.loc['Total'] = settlement.sum()
+    settlement['appointments'] = settlement['appointments'].astype(int)
+    settlement.to_csv(settlement_path)
+    return billed, len(invoices), invoices_path, lines_path, settlement_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch billing and invoice run")
+    parser.add_argument("paths", nargs="*", default=[AUDIT_PATH],
+                        help=f"appointment CSV exports or JSON-lines logs (default: {AUDIT_PATH})")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today(), help="first date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="last date (YYYY-MM-DD), defaults to --start")
+    parser.add_argument("--out", default=str(OUTPUT_DIR), help="output directory")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="rows per chunk")
+    args = parser.parse_args()
+
+    # No audit log yet just means nothing was booked; paths given explicitly must exist
+    paths = [path for path in args.paths if path != AUDIT_PATH or AUDIT_PATH.exists()]
+    if not paths:
+        print(f"No bookings to bill: {AUDIT_PATH} does not exist yet")
+
+    billed, patients, invoices_path, lines_path, settlement_path = run_billing(
+        paths, args.start, args.end or args.start, get_catalog().lab_prices, args.out, args.chunksize
+    )
+    print(f"Billed {billed} appointments on {patients} invoices")
+    print(f"Invoices:   {invoices_path}")
+    print(f"Line items: {lines_path}")
+    print(f"Settlement: {settlement_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+# Reference data shared by health_app.py, main.py and the batch tools:
+# hospital branches, departments, doctors, lab tests, symptoms and
+# appointment time slots.
+#
+# The catalog is immutable and built once per process (get_catalog()). Every
+# entity has a stable integer ID equal to its position in the catalog tuples,
+# and the indexes below make every lookup O(1), so a catalog with thousands
+# of doctors and tests costs no more per lookup than the built-in one.
+#
+# Names and rooms are lookup keys (the booking form, feed records and old
+# audit lines refer to doctors by name), so a catalog that repeats a branch,
+# department or doctor name, or a doctor's room, is rejected at load with a
+# ValueError instead of one entry silently shadowing the other.
+#
+# Set HOSPITAL_CATALOG to a JSON file with the same shape as DEFAULT_CATALOG
+# to load a larger external catalog instead.
+
+DEFAULT_CATALOG = {
+    "branches": [
+        {"name": "Central", "code": "CEN"},
+        {"name": "Northside", "code": "NTH"},
+        {"name": "Lakeview", "code": "LKV"}
+    ],
+    "time_slots": ["10:00 AM", "11:00 AM", "2:00 PM", "4:00 PM", "5:00 PM"],
+    "lab_tests": {
+        "X-ray": 1000,
+        "MRI": 12000,
+        "CT Scan": 10000,
+        "LFT": 800,
+        "RFT": 700,
+        "CBC": 200
+    },
+    "departments": [
+        {
+            "name": "General Medicine",
+            "doctors": [
+                {"name": "Dr. Meera Shah", "room": "101", "experience": 5},
+                {"name": "Dr. Raj Patel", "room": "102", "experience": 7},
+                {"name": "Dr. Neha Sharma", "room": "103", "experience": 3}
+            ],
+            "symptoms": ["fever", "cough", "cold", "vomiting", "headache", "fatigue"]
+        },
+        {
+            "name": "Cardiology",
+            "doctors": [
+                {"name": "Dr. Ravi Kumar", "room": "201", "experience": 6},
+                {"name": "Dr. Priya Gupta", "room": "202", "experience": 4},
+                {"name": "Dr. Anjali Singh", "room": "203", "experience": 2}
+            ],
+            "symptoms": ["chest pain", "heart pain", "palpitations", "shortness of breath"]
+        },
+        {
+            "name": "Neurology",
+            "doctors": [
+                {"name": "Dr. Sanjay Verma", "room": "301", "experience": 8},
+                {"name": "Dr. Anjali Sharma", "room": "302", "experience": 5},
+                {"name": "Dr. Ravi Patel", "room": "303", "experience": 3}
+            ],
+            "symptoms": ["headache", "migraine", "dizziness", "numbness", "seizures"]
+        },
+        {
+            "name": "Pediatrician",
+            "doctors": [
+                {"name": "Dr. Neha Gupta", "room": "401", "experience": 4},
+                {"name": "Dr. Sanjay Singh", "room": "402", "experience": 6},
+                {"name": "Dr. Priya Patel", "room": "403", "experience": 2}
+            ],
+            "symptoms": ["child fever", "vaccination", "cough", "rash", "stomach pain"]
+        },
+        {
+            "name": "Nephrologist",
+            "doctors": [
+                {"name": "Dr. Ravi Sharma", "room": "501", "experience": 7},
+                {"name": "Dr. Neha Patel", "room": "502", "experience": 5},
+                {"name": "Dr. Sanjay Gupta", "room": "503", "experience": 3}
+            ],
+            "symptoms": ["kidney pain", "urinary issues", "swelling", "blood in urine"]
+        },
+        {
+            "name": "Radiology",
+            "doctors": [
+                {"name": "Dr. Priya Singh", "room": "601", "experience": 6},
+                {"name": "Dr. Anjali Patel", "room": "602", "experience": 4},
+                {"name": "Dr. Ravi Gupta", "room": "603", "experience": 2}
+            ],
+            "symptoms": ["x-ray", "scan", "imaging required"]
+        }
+    ],
+    # Department suggested at reception for symptoms several departments
+    # treat. Symptoms not listed here go to the first department listing them.
+    "triage": {
+        "headache": "Neurology"
+    }
+}
+
+
+@dataclass(frozen=True)
+class Branch:
+    id: int
+    name: str
+    code: str
+
+
+@dataclass(frozen=True)
+class Department:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class Doctor:
+    id: int
+    name: str
+    room: str
+    experience: int
+    department_id: int
+
+
+@dataclass(frozen=True)
+class LabTest:
+    id: int
+    name: str
+    price: int
+
+
+@dataclass(frozen=True)
+class Symptom:
+    id: int
+    name: str
+    department_ids: tuple
+    triage_department_id: int
+
+
+def _unique_index(items, key, what):
+    index = {}
+    for item in items:
+        value = getattr(item, key)
+        if value in index:
+            raise ValueError(f"Catalog has two {what}s {value!r} (IDs {index[value].id} and {item.id})")
+        index[value] = item
+    return MappingProxyType(index)
+
+
+class Catalog:
+    def __init__(self, data):
+        departments, doctors, symptom_depts = [], [], {}
+        for dept_id, dept in enumerate(data["departments"]):
+            departments.append(Department(dept_id, dept["name"]))
+            for doc in dept["doctors"]:
+                doctors.append(Doctor(len(doctors), doc["name"], str(doc["room"]), int(doc["experience"]), dept_id))
+            for name in dept.get("symptoms", []):
+                symptom_depts.setdefault(name, []).append(dept_id)
+
+        branches = data.get("branches") or [{"name": "Main", "code": "MAIN"}]
+        self.branches = tuple(Branch(i, b["name"], b["code"]) for i, b in enumerate(branches))
+        self.time_slots = tuple(data["time_slots"])
+        self.departments = tuple(departments)
+        self.doctors = tuple(doctors)
+        self.lab_tests = tuple(LabTest(i, name, price) for i, (name, price) in enumerate(data["lab_tests"].items()))
+
+        self.department_by_name = _unique_index(self.departments, "name", "department name")
+        triage = {name: self.department_by_name[dept].id for name, dept in data.get("triage", {}).items()}
+        self.symptoms = tuple(
+            Symptom(i, name, tuple(dept_ids), triage.get(name, dept_ids[0]))
+            for i, (name, dept_ids) in enumerate(symptom_depts.items())
+        )
+
+        # O(1) indexes
+        self.branch_by_name = _unique_index(self.branches, "name", "branch name")
+        self.doctor_by_name = _unique_index(self.doctors, "name", "doctor name")
+        self.doctor_by_room = _unique_index(self.doctors, "room", "doctor room")
+        self.lab_test_by_name = MappingProxyType({t.name: t for t in self.lab_tests})
+        self.symptom_by_name = MappingProxyType({s.name: s for s in self.symptoms})
+        by_dept = {d.id: [] for d in self.departments}
+        for doc in self.doctors:
+            by_dept[doc.department_id].append(doc)
+        self.doctors_by_department = MappingProxyType({k: tuple(v) for k, v in by_dept.items()})
+        symptoms_by_dept = {d.id: [] for d in self.departments}
+        for dept_id, dept in enumerate(data["departments"]):
+            symptoms_by_dept[dept_id] = tuple(self.symptom_by_name[name] for name in dept.get("symptoms", []))
+        self.symptoms_by_department = MappingProxyType(symptoms_by_dept)
+        self.lab_prices = MappingProxyType({t.name: t.price for t in self.lab_tests})
+
+    def department(self, name):
+        return self.department_by_name[name]
+
+    def doctors_in(self, department_name):
+        return self.doctors_by_department[self.department_by_name[department_name].id]
+
+    def symptoms_in(self, department_name):
+        return self.symptoms_by_department[self.department_by_name[department_name].id]
+
+    def doctor_of(self, record):
+        # Feed and audit records carry doctor_id; older lines only the name
+        if record.get('doctor_id') is not None:
+            return self.doctors[record['doctor_id']]
+        return self.doctor_by_name[record['doctor_name']]
+
+    def triage(self, symptom_name):
+        return self.departments[self.symptom_by_name[symptom_name].triage_department_id]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+@lru_cache(maxsize=None)
+def get_catalog():
+    path = os.environ.get("HOSPITAL_CATALOG")
+    return Catalog.load(path) if path else Catalog(DEFAULT_CATALOG)
@@ -0,0 +1,85 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Batch Holt-Winters forecasting of appointment load.
+#
+# Every department or doctor is one series of appointments per time slot,
+# (days x slots) steps long, with a seasonal period of one week of slots
+# (7 x slots), so the seasonal terms capture both day-of-week and
+# time-of-day patterns. Additive Holt-Winters (level + trend + season) is
+# fitted to all series at once: the recursion walks forward in time and each
+# step updates every (series, parameter set) pair in one array operation.
+# Smoothing parameters come from a grid; each series keeps the set with the
+# lowest one-step-ahead squared error.
+
+ALPHAS = (0.02, 0.05, 0.1, 0.2, 0.4)
+BETAS = (0.0, 0.001, 0.01)
+GAMMAS = (0.05, 0.1, 0.2, 0.4)
+
+
+def slot_counts(df, by, entities, start, days, time_slots):
+    # (entities, days * slots) appointment counts, one bincount pass
+    index = {name: i for i, name in enumerate(entities)}
+    slot_index = {slot: i for i, slot in enumerate(time_slots)}
+    slots = len(time_slots)
+    codes = df[by].map(index).to_numpy()
+    day = (pd.to_datetime(df['appointment_date']) - pd.Timestamp(start)).dt.days.to_numpy()
+    slot = df['appointment_time'].map(slot_index).to_numpy()
+    keep = ~pd.isna(codes) & ~pd.isna(slot) & (day >= 0) & (day < days)
+    flat = (codes[keep].astype(int) * days + day[keep]) * slots + slot[keep].astype(int)
+    return np.bincount(flat, minlength=len(entities) * days * slots).reshape(len(entities), days * slots).astype(float)
+
+
+class HoltWintersBatch:
+    def __init__(self, period):
+        self.period = period
+
+    def fit(self, y):
+        # y: (series, steps), at least two full periods long
+        m = self.period
+        grid = np.array(list(itertools.product(ALPHAS, BETAS, GAMMAS)))
+        n, steps = y.shape
+        alpha, beta, gamma = (np.tile(grid[:, i], n) for i in range(3))
+        # Row i of the batch is series i // len(grid) with parameter set
+        # i % len(grid); observations are gathered one step at a time
+        series = np.repeat(np.arange(n), len(grid))
+
+        # Start from the first two periods: level and trend from their means,
+        # season from the first period's deviations
+        first, second = y[:, :m].mean(axis=1)[series], y[:, m:2 * m].mean(axis=1)[series]
+        level = first.copy()
+        trend = (second - first) / m
+        # Seasonal terms stored (period, batch) so each step reads one
+        # contiguous row; observations likewise (steps, series)
+        season = (y[series, :m] - first[:, None]).T.copy()
+        observations = np.ascontiguousarray(y.T)
+        sse = np.zeros(len(series))
+
+        for t in range(m, steps):
+            seasonal = season[t % m]
+            observed = observations[t][series]
+            error = observed - (level + trend + seasonal)
+            sse += error ** 2
+            previous = level
+            level = alpha * (observed - seasonal) + (1 - alpha) * (level + trend)
+            trend = beta * (level - previous) + (1 - beta) * trend
+            seasonal *= 1 - gamma
+            seasonal += gamma * (observed - level)
+
+        best = sse.reshape(n, len(grid)).argmin(axis=1)
+        pick = np.arange(n) * len(grid) + best
+        self.params = grid[best]
+        self.level = level[pick]
+        self.trend = trend[pick]
+        self.season = season[:, pick].T
+        self.rmse = np.sqrt(sse[pick] / max(steps - m, 1))
+        self.steps = steps
+        return self
+
+    def forecast(self, horizon):
+        h = np.arange(1, horizon + 1)
+        positions = (self.steps + h - 1) % self.period
+        load = self.level[:, None] + h[None, :] * self.trend[:, None] + self.season[:, positions]
+        return np.clip(load, 0, None)
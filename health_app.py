@@ -1,74 +1,26 @@
 import streamlit as st
+import os
 import re
-from datetime import datetime, date
+from datetime import date
 import plotly.express as px
 import plotly.graph_objects as go
 
+from appointment_store import AppointmentLog, AppointmentRecord
+from availability import get_availability
+from catalog import get_catalog
+from live_feed import POLL_SECONDS, LiveTotals, publish
+from notifications import SideEffectQueue
+from patient_registry import PatientRegistry
+
 # Page configuration
 st.set_page_config(page_title="Hospital Appointment System", page_icon="🏥", layout="wide")
 
-# Lab Tests with Pricing
-lab_tests = {
-    "X-ray": 1000,
-    "MRI": 12000,
-    "CT Scan": 10000,
-    "LFT": 800,
-    "RFT": 700,
-    "CBC": 200
-}
+# Reference data (departments, doctors, lab tests, symptoms) comes from the
+# shared catalog, built once per process
+catalog = get_catalog()
 
-# Department and Doctor data
-department = {
-    "General Medicine": [
-        {"name": "Dr. Meera Shah", "room": "101", "experience": 5, "patients": 0},
-        {"name": "Dr. Raj Patel", "room": "102", "experience": 7, "patients": 0},
-        {"name": "Dr. Neha Sharma", "room": "103", "experience": 3, "patients": 0}
-    ],
-    "Cardiology": [
-        {"name": "Dr. Ravi Kumar", "room": "201", "experience": 6, "patients": 0},
-        {"name": "Dr. Priya Gupta", "room": "202", "experience": 4, "patients": 0},
-        {"name": "Dr. Anjali Singh", "room": "203", "experience": 2, "patients": 0}
-    ],
-    "Neurology": [
-        {"name": "Dr. Sanjay Verma", "room": "301", "experience": 8, "patients": 0},
-        {"name": "Dr. Anjali Sharma", "room": "302", "experience": 5, "patients": 0},
-        {"name": "Dr. Ravi Patel", "room": "303", "experience": 3, "patients": 0}
-    ],
-    "Pediatrician": [
-        {"name": "Dr. Neha Gupta", "room": "401", "experience": 4, "patients": 0},
-        {"name": "Dr. Sanjay Singh", "room": "402", "experience": 6, "patients": 0},
-        {"name": "Dr. Priya Patel", "room": "403", "experience": 2, "patients": 0}
-    ],
-    "Nephrologist": [
-        {"name": "Dr. Ravi Sharma", "room": "501", "experience": 7, "patients": 0},
-        {"name": "Dr. Neha Patel", "room": "502", "experience": 5, "patients": 0},
-        {"name": "Dr. Sanjay Gupta", "room": "503", "experience": 3, "patients": 0}
-    ],
-    "Radiology": [
-        {"name": "Dr. Priya Singh", "room": "601", "experience": 6, "patients": 0},
-        {"name": "Dr. Anjali Patel", "room": "602", "experience": 4, "patients": 0},
-        {"name": "Dr. Ravi Gupta", "room": "603", "experience": 2, "patients": 0}
-    ]
-}
-
-symptom_to_dept = {
-    "fever": "General Medicine",
-    "cough": "General Medicine",
-    "cold": "General Medicine",
-    "vomiting": "General Medicine",
-    "chest pain": "Cardiology",
-    "heart pain": "Cardiology",
-    "palpitations": "Cardiology",
-    "headache": "Neurology",
-    "migraine": "Neurology",
-    "dizziness": "Neurology",
-    "child fever": "Pediatrician",
-    "vaccination": "Pediatrician",
-    "kidney pain": "Nephrologist",
-    "urinary issues": "Nephrologist",
-    "x-ray": "Radiology",
-    "scan": "Radiology"
-}
+# Branch this booking desk belongs to
+BRANCH = os.environ.get("HOSPITAL_BRANCH", catalog.branches[0].name)
 
 # Validation functions
 def validate_name(name):
@@ -106,100 +58,228 @@ def validate_billing(amount):
         return False, "Billing amount seems unusually high"
     return True, ""
 
+# One background side-effects worker per process, shared by all sessions
+@st.cache_resource
+def side_effects():
+    return SideEffectQueue().start()
+
+# Slot occupancy for every doctor of this branch, shared by all sessions
+# in the process (and by load_test.py, which runs them in one)
+def availability():
+    return get_availability(BRANCH)
+
+# Patient identities (mobile, email, name + DOB), shared by all sessions in
+# the process and reloaded from disk on restart
+@st.cache_resource
+def patient_registry():
+    return PatientRegistry.load()
+
+# Bookings from every desk, tailed from the live feed; one per process
+@st.cache_resource
+def live_totals():
+    return LiveTotals()
+
 # Initialize session state
 if 'step' not in st.session_state:
     st.session_state.step = 1
 if 'patient_data' not in st.session_state:
     st.session_state.patient_data = {}
-if 'department_data' not in st.session_state:
-    st.session_state.department_data = department
-if 'all_appointments' not in st.session_state:
-    st.session_state.all_appointments = []
+if 'doctor_patients' not in st.session_state:
+    # Patients booked per doctor in this session, indexed by catalog doctor ID
+    st.session_state.doctor_patients = [0] * len(catalog.doctors)
+if 'appointments' not in st.session_state:
+    st.session_state.appointments = AppointmentLog()
 
-# Sidebar for Analytics
-with st.sidebar:
-    st.title("📊 Analytics Dashboard")
+if 'booking_version' not in st.session_state:
+    st.session_state.booking_version = 0
+if 'sidebar_cache' not in st.session_state:
+    st.session_state.sidebar_cache = {}
+
+# Sidebar analytics are only rebuilt when the booking version changes, i.e.
+# after a booking or cancellation (or, in live mode, when the feed has new
+# bookings). Every other rerun reuses the cached figure and stats for the
+# selected department.
+ALL_DEPARTMENTS = "All Departments"
+
+def build_sidebar_analytics(selected_dept, counts):
+    if selected_dept == ALL_DEPARTMENTS:
+        # One pass over every doctor for the whole-hospital view
+        dept_totals = {}
+        stats = []
+        for doc in catalog.doctors:
+            if counts[doc.id] > 0:
+                dept = catalog.departments[doc.department_id].name
+                dept_totals[dept] = dept_totals.get(dept, 0) + counts[doc.id]
+                stats.append((doc.name, counts[doc.id], f"{dept} · Room {doc.room}"))
+        names, counts = list(dept_totals), list(dept_totals.values())
+        title = "Patients per Department"
+    else:
+        stats = [(doc.name, counts[doc.id], f"Room {doc.room}") for doc in catalog.doctors_in(selected_dept) if counts[doc.id] > 0]
+        names, counts = [row[0] for row in stats], [row[1] for row in stats]
+        title = "Patients per Doctor"
     
-    if st.button("🔄 Refresh Stats"):
-        st.rerun()
+    fig = None
+    if counts:
+        fig = px.pie(
+            values=counts,
+            names=names,
+            title=title,
+            hole=0.3
+        )
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+    return {'total': sum(counts), 'fig': fig, 'stats': stats}
+
+def sidebar_analytics(selected_dept, counts, version):
+    cache = st.session_state.sidebar_cache
+    if (selected_dept, version) not in cache:
+        # Drop entries from older versions so the cache stays small
+        for key in [key for key in cache if key[1] != version]:
+            del cache[key]
+        cache[(selected_dept, version)] = build_sidebar_analytics(selected_dept, counts)
+    return cache[(selected_dept, version)]
+
+# Sidebar for Analytics
+#
+# The panel is a fragment: refreshing it or changing the department reruns
+# the sidebar only. In live mode it also reruns itself every POLL_SECONDS and
+# shows bookings from every desk of this branch, read from the shared feed.
+def sidebar_panel(live):
+    refresh = st.button("🔄 Refresh Stats")
     
     # Department selector for analytics
     selected_dept_analytics = st.selectbox(
         "Select Department for Analytics",
-        list(department.keys())
+        [ALL_DEPARTMENTS] + [d.name for d in catalog.departments]
     )
     
-    # Get doctors from selected department
-    doctors_in_dept = st.session_state.department_data[selected_dept_analytics]
-    
-    # Check if any doctor has patients
-    total_patients = sum(doc['patients'] for doc in doctors_in_dept)
+    if live:
+        feed = live_totals()
+        feed.poll(force=refresh)
+        snapshot = feed.totals(BRANCH)
+        counts = [snapshot['by_doctor'].get(doc.name, 0) for doc in catalog.doctors]
+        analytics = sidebar_analytics(selected_dept_analytics, counts, ('live', snapshot['seq']))
+    else:
+        analytics = sidebar_analytics(selected_dept_analytics, st.session_state.doctor_patients,
+                                      st.session_state.booking_version)
     
-    if total_patients > 0:
+    if analytics['total'] > 0:
         st.subheader(f"Patient Distribution - {selected_dept_analytics}")
-        
-        # Prepare data for pie chart
-        doctor_names = [doc['name'] for doc in doctors_in_dept if doc['patients'] > 0]
-        patient_counts = [doc['patients'] for doc in doctors_in_dept if doc['patients'] > 0]
-        
-        # Create pie chart
-        fig = px.pie(
-            values=patient_counts,
-            names=doctor_names,
-            title=f"Patients per Doctor",
-            hole=0.3
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(analytics['fig'], use_container_width=True)
         
         # Show detailed stats
         st.subheader("Detailed Statistics")
-        for doc in doctors_in_dept:
-            if doc['patients'] > 0:
-                st.metric(
-                    doc['name'],
-                    f"{doc['patients']} patients",
-                    f"Room {doc['room']}"
-                )
+        for doctor_name, patients, location in analytics['stats']:
+            st.metric(
+                doctor_name,
+                f"{patients} patients",
+                location
+            )
     else:
         st.info(f"No patients registered yet in {selected_dept_analytics}")
     
     st.markdown("---")
-    st.metric("Total Appointments", len(st.session_state.all_appointments))
+    if live:
+        # This branch's bookings since this screen last looked (none when the
+        # feed starts a new day)
+        new = max(snapshot['appointments'] - st.session_state.get('live_seen', snapshot['appointments']), 0)
+        st.session_state.live_seen = snapshot['appointments']
+        st.metric(f"Appointments Today ({BRANCH}, all desks)", snapshot['appointments'],
+                  f"+{new} new" if new else None)
+    else:
+        st.metric("Total Appointments", st.session_state.appointments.total)
+    st.metric("Free Slots Today (all doctors)", availability().free_count(date.today()))
+
+with st.sidebar:
+    st.title("📊 Analytics Dashboard")
+    live = st.toggle("🔴 Live", key="live_mode", help=f"Show today's bookings from every desk, refreshed every {POLL_SECONDS}s")
+    st.fragment(run_every=POLL_SECONDS if live else None)(sidebar_panel)(live)
 
 # Main UI
+#
+# Only the active step is live. It runs inside an st.fragment so its widget
+# interactions rerun that step alone, and its inputs are batched in a form
+# so typing or ticking boxes does not rerun anything until submit. Completed
+# steps render from a summary cached when the step was finished. Moving
+# between steps is the only thing that reruns the whole script.
 st.title("🏥 Hospital Appointment System")
 st.markdown("---")
 
+STEP_TITLES = {
+    1: "📋 Step 1: Patient Information",
+    2: "🩺 Step 2: Symptoms",
+    3: "👨‍⚕️ Step 3: Select Doctor",
+    4: "🧪 Step 4: Select Lab Tests",
+    5: "🕐 Step 5: Select Time Slot & Additional Details"
+}
+
+if 'step_summaries' not in st.session_state:
+    st.session_state.step_summaries = {}
+
+def summarize_step(step):
+    data = st.session_state.patient_data
+    if step == 1:
+        return (f"**{data['name']}** · {data['age']} years · {data['gender']} · {data['blood_group']} · "
+                f"DOB {data['dob'].strftime('%d/%m/%Y')} · {data['mobile']} · {data['email']}")
+    if step == 2:
+        return f"{', '.join(s.title() for s in data['symptoms'])} → **{data['department']}**"
+    if step == 3:
+        doctor = catalog.doctors[data['doctor_id']]
+        return f"**{doctor.name}** · Room {doctor.room} · {doctor.experience} years experience"
+    if step == 4:
+        if not data['lab_tests']:
+            return "No lab tests selected"
+        return f"{', '.join(data['lab_tests'])} · ₹{data['lab_cost']:,}"
+    return (f"{data['appointment_date'].strftime('%d/%m/%Y')} at {data['time_slot']} · "
+            f"{data['patient_type']} ({data['patient_id']}) · Total ₹{data['total_billing']:,.2f}")
+
+def complete_step(step):
+    st.session_state.step_summaries[step] = summarize_step(step)
+    st.session_state.step = step + 1
+    st.rerun()
+
+def go_back(step):
+    st.session_state.step = step
+    st.rerun()
+
+def render_completed_step(step):
+    if step > 1:
+        st.markdown("---")
+    st.subheader(f"✔️ {STEP_TITLES[step]}")
+    st.markdown(st.session_state.step_summaries[step])
+
 # Step 1: Patient Information
-if st.session_state.step >= 1:
-    st.header("📋 Step 1: Patient Information")
+@st.fragment
+def patient_info_step():
+    st.header(STEP_TITLES[1])
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        name = st.text_input("Full Name *", value=st.session_state.patient_data.get('name', ''))
-        age = st.number_input("Age *", min_value=1, max_value=120, value=st.session_state.patient_data.get('age', 25))
-        blood_group = st.selectbox("Blood Group *", 
-                                   ['Select', 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-'],
-                                   index=0 if 'blood_group' not in st.session_state.patient_data else 
-                                   ['Select', 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-'].index(st.session_state.patient_data['blood_group']))
+    with st.form("step1_form", border=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            name = st.text_input("Full Name *", value=st.session_state.patient_data.get('name', ''))
+            age = st.number_input("Age *", min_value=1, max_value=120, value=st.session_state.patient_data.get('age', 25))
+            blood_group = st.selectbox("Blood Group *", 
+                                       ['Select', 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-'],
+                                       index=0 if 'blood_group' not in st.session_state.patient_data else 
+                                       ['Select', 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-'].index(st.session_state.patient_data['blood_group']))
+        
+        with col2:
+            gender = st.selectbox("Gender *", ['Select', 'Male', 'Female', 'Other'],
+                                 index=0 if 'gender' not in st.session_state.patient_data else
+                                 ['Select', 'Male', 'Female', 'Other'].index(st.session_state.patient_data['gender']))
+            mobile = st.text_input("Mobile Number *", value=st.session_state.patient_data.get('mobile', ''),
+                                  placeholder="e.g., 9876543210")
+            email = st.text_input("Email Address *", value=st.session_state.patient_data.get('email', ''),
+                                 placeholder="e.g., example@email.com")
+        
+        dob = st.date_input("Date of Birth *", 
+                           value=st.session_state.patient_data.get('dob', date(2000, 1, 1)),
+                           min_value=date(1900, 1, 1),
+                           max_value=date.today())
+        
+        submitted = st.form_submit_button("Continue to Symptoms →", key="step1_btn", type="primary")
     
-    with col2:
-        gender = st.selectbox("Gender *", ['Select', 'Male', 'Female', 'Other'],
-                             index=0 if 'gender' not in st.session_state.patient_data else
-                             ['Select', 'Male', 'Female', 'Other'].index(st.session_state.patient_data['gender']))
-        mobile = st.text_input("Mobile Number *", value=st.session_state.patient_data.get('mobile', ''),
-                              placeholder="e.g., 9876543210")
-        email = st.text_input("Email Address *", value=st.session_state.patient_data.get('email', ''),
-                             placeholder="e.g., example@email.com")
-    
-    dob = st.date_input("Date of Birth *", 
-                       value=st.session_state.patient_data.get('dob', date(2000, 1, 1)),
-                       min_value=date(1900, 1, 1),
-                       max_value=date.today())
-    
-    if st.button("Continue to Symptoms →", key="step1_btn", type="primary"):
+    if submitted:
         errors = []
         
         is_valid, msg = validate_name(name)
@@ -237,32 +317,32 @@ if st.session_state.step >= 1:
                 'email': email,
                 'dob': dob
             })
-            st.session_state.step = 2
-            st.rerun()
+            complete_step(1)
 
 # Step 2: Symptoms and Department
-if st.session_state.step >= 2:
-    st.markdown("---")
-    st.header("🩺 Step 2: Symptoms")
-    
-    st.write("Select your symptoms (you can choose multiple):")
+@st.fragment
+def symptoms_step():
+    st.header(STEP_TITLES[2])
     
-    symptoms_list = list(symptom_to_dept.keys())
-    col1, col2, col3 = st.columns(3)
-    
-    selected_symptoms = []
-    for i, symptom in enumerate(symptoms_list):
-        col = [col1, col2, col3][i % 3]
-        with col:
-            if st.checkbox(symptom.title(), key=f"symptom_{symptom}"):
-                selected_symptoms.append(symptom)
+    with st.form("step2_form", border=False):
+        st.write("Select your symptoms (you can choose multiple):")
+        
+        symptoms_list = [symptom.name for symptom in catalog.symptoms]
+        col1, col2, col3 = st.columns(3)
+        
+        selected_symptoms = []
+        for i, symptom in enumerate(symptoms_list):
+            col = [col1, col2, col3][i % 3]
+            with col:
+                if st.checkbox(symptom.title(), key=f"symptom_{symptom}"):
+                    selected_symptoms.append(symptom)
+        
+        st.form_submit_button("Suggest Department 🔍", key="symptoms_submit")
     
     if selected_symptoms:
         suggested_departments = set()
         for s in selected_symptoms:
-            dept = symptom_to_dept.get(s.lower())
-            if dept:
-                suggested_departments.add(dept)
+            suggested_departments.add(catalog.triage(s).name)
         
         if suggested_departments:
             st.success(f"✅ Suggested Department(s): {', '.join(suggested_departments)}")
@@ -274,153 +354,199 @@ if st.session_state.step >= 2:
                 if st.button("Continue to Doctor Selection →", key="step2_btn", type="primary"):
                     st.session_state.patient_data['symptoms'] = selected_symptoms
                     st.session_state.patient_data['department'] = selected_dept
-                    st.session_state.step = 3
-                    st.rerun()
+                    complete_step(2)
     else:
         st.info("ℹ️ Please select at least one symptom")
     
     if st.button("← Back", key="back1"):
-        st.session_state.step = 1
-        st.rerun()
+        go_back(1)
 
 # Step 3: Doctor Selection
-if st.session_state.step >= 3:
-    st.markdown("---")
-    st.header("👨‍⚕️ Step 3: Select Doctor")
+@st.fragment
+def doctor_step():
+    st.header(STEP_TITLES[3])
     
     selected_dept = st.session_state.patient_data['department']
-    doctors = st.session_state.department_data[selected_dept]
+    doctors = catalog.doctors_in(selected_dept)
+    counts = st.session_state.doctor_patients
     
     st.subheader(f"Available Doctors in {selected_dept}")
     
+    slots = availability()
+    earliest = slots.earliest_in_department([doc.id for doc in doctors])
+    if earliest:
+        doctor_id, day, slot = earliest
+        st.info(f"🗓️ Earliest slot in {selected_dept}: {catalog.doctors[doctor_id].name}, "
+                f"{day.strftime('%d/%m/%Y')} at {slot}")
+    
     cols = st.columns(len(doctors))
     selected_doctor_idx = None
     
     for i, doc in enumerate(doctors):
         with cols[i]:
+            next_slot = slots.next_free(doc.id, 1)
+            next_label = f"{next_slot[0][0].strftime('%d/%m')} {next_slot[0][1]}" if next_slot else "Fully booked"
             st.markdown(f"""
             <div style='border: 2px solid #ddd; padding: 15px; border-radius: 10px; text-align: center;'>
-                <h4>{doc['name']}</h4>
-                <p>Room: {doc['room']}</p>
-                <p>Experience: {doc['experience']} years</p>
-                <p>Patients: {doc['patients']}</p>
+                <h4>{doc.name}</h4>
+                <p>Room: {doc.room}</p>
+                <p>Experience: {doc.experience} years</p>
+                <p>Patients: {counts[doc.id]}</p>
+                <p>Next free: {next_label}</p>
             </div>
             """, unsafe_allow_html=True)
             if st.button(f"Select", key=f"doc_{i}"):
                 selected_doctor_idx = i
     
     if selected_doctor_idx is not None:
-        st.session_state.patient_data['doctor'] = doctors[selected_doctor_idx]
-        st.session_state.patient_data['doctor_index'] = selected_doctor_idx
-        st.session_state.step = 4
-        st.rerun()
+        st.session_state.patient_data['doctor_id'] = doctors[selected_doctor_idx].id
+        complete_step(3)
     
     if st.button("← Back", key="back2"):
-        st.session_state.step = 2
-        st.rerun()
+        go_back(2)
 
 # Step 4: Lab Tests Selection
-if st.session_state.step >= 4:
-    st.markdown("---")
-    st.header("🧪 Step 4: Select Lab Tests")
-    
-    st.write("Select the lab tests required for this patient:")
-    
-    selected_tests = []
-    total_lab_cost = 0
-    
-    col1, col2 = st.columns([3, 1])
-    
-    with col1:
-        for test_name, price in lab_tests.items():
-            if st.checkbox(f"{test_name} - ₹{price:,}", key=f"lab_{test_name}"):
-                selected_tests.append(test_name)
-                total_lab_cost += price
+@st.fragment
+def lab_tests_step():
+    st.header(STEP_TITLES[4])
     
-    with col2:
-        st.metric("Total Lab Cost", f"₹{total_lab_cost:,}")
-        st.metric("Tests Selected", len(selected_tests))
-    
-    if selected_tests:
-        st.success(f"Selected Tests: {', '.join(selected_tests)}")
-    else:
-        st.info("ℹ️ No lab tests selected (optional)")
+    with st.form("step4_form", border=False):
+        st.write("Select the lab tests required for this patient:")
+        
+        selected_tests = []
+        total_lab_cost = 0
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            for test in catalog.lab_tests:
+                if st.checkbox(f"{test.name} - ₹{test.price:,}", key=f"lab_{test.name}"):
+                    selected_tests.append(test.name)
+                    total_lab_cost += test.price
+        
+        with col2:
+            st.metric("Total Lab Cost", f"₹{total_lab_cost:,}")
+            st.metric("Tests Selected", len(selected_tests))
+        
+        if selected_tests:
+            st.success(f"Selected Tests: {', '.join(selected_tests)}")
+        else:
+            st.info("ℹ️ No lab tests selected (optional)")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.form_submit_button("Update Total", key="lab_update")
+        with col2:
+            submitted = st.form_submit_button("Continue to Appointment Details →", key="step4_btn", type="primary")
     
-    if st.button("Continue to Appointment Details →", key="step4_btn", type="primary"):
+    if submitted:
         st.session_state.patient_data['lab_tests'] = selected_tests
         st.session_state.patient_data['lab_cost'] = total_lab_cost
-        st.session_state.step = 5
-        st.rerun()
+        complete_step(4)
     
     if st.button("← Back", key="back3"):
-        st.session_state.step = 3
-        st.rerun()
+        go_back(3)
 
 # Step 5: Time Slot and Additional Details
-if st.session_state.step >= 5:
-    st.markdown("---")
-    st.header("🕐 Step 5: Select Time Slot & Additional Details")
-    
-    time_slots = ["10:00 AM", "11:00 AM", "2:00 PM", "4:00 PM", "5:00 PM"]
+@st.fragment
+def appointment_step():
+    st.header(STEP_TITLES[5])
     
-    col1, col2 = st.columns(2)
+    doctor_id = st.session_state.patient_data['doctor_id']
+    slots = availability()
     
-    with col1:
-        selected_slot = st.selectbox("Time Slot *", ['Select'] + time_slots)
-        appointment_date = st.date_input("Appointment Date *", 
-                                        min_value=date.today(),
-                                        value=date.today())
+    next_free = slots.next_free(doctor_id, 5)
+    if next_free:
+        st.info("🗓️ Next available: " + " · ".join(f"{day.strftime('%d/%m')} {slot}" for day, slot in next_free))
+    else:
+        st.warning(f"No free slots for this doctor in the next {slots.horizon_days} days")
     
-    with col2:
-        patient_type = st.selectbox("Patient Type *", ['Select', 'New Patient', 'Existing Patient'])
-        consultation_fee = st.number_input("Consultation Fee (₹) *", min_value=0.0, value=500.0, step=100.0)
+    # Outside the form so the slot list follows the chosen date
+    appointment_date = st.date_input("Appointment Date *", 
+                                    min_value=date.today(),
+                                    max_value=slots.last_day,
+                                    value=date.today())
+    free_slots = slots.free_slots(doctor_id, appointment_date)
     
-    # Calculate total billing
-    lab_cost = st.session_state.patient_data.get('lab_cost', 0)
-    total_billing = consultation_fee + lab_cost
+    data = st.session_state.patient_data
+    known_id = patient_registry().lookup(data['name'], data['dob'], data['mobile'], data['email'])
+    if known_id:
+        st.success(f"👤 Existing patient {known_id}")
+    else:
+        st.info("👤 New patient, a patient ID is assigned on confirmation")
     
-    st.markdown("---")
-    st.subheader("💰 Billing Summary")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Consultation Fee", f"₹{consultation_fee:,.2f}")
-    with col2:
-        st.metric("Lab Tests Cost", f"₹{lab_cost:,.2f}")
-    with col3:
-        st.metric("Total Amount", f"₹{total_billing:,.2f}", delta=None)
+    with st.form("step5_form", border=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            selected_slot = st.selectbox("Time Slot *", ['Select'] + free_slots)
+            if not free_slots:
+                st.caption("No free slots on this date")
+        
+        with col2:
+            consultation_fee = st.number_input("Consultation Fee (₹) *", min_value=0.0, value=500.0, step=100.0)
+        
+        # Calculate total billing
+        lab_cost = st.session_state.patient_data.get('lab_cost', 0)
+        total_billing = consultation_fee + lab_cost
+        
+        st.markdown("---")
+        st.subheader("💰 Billing Summary")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Consultation Fee", f"₹{consultation_fee:,.2f}")
+        with col2:
+            st.metric("Lab Tests Cost", f"₹{lab_cost:,.2f}")
+        with col3:
+            st.metric("Total Amount", f"₹{total_billing:,.2f}", delta=None)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.form_submit_button("Update Bill", key="bill_update")
+        with col2:
+            submitted = st.form_submit_button("Confirm Appointment ✅", key="step5_btn", type="primary")
     
-    if st.button("Confirm Appointment ✅", key="step5_btn", type="primary"):
+    if submitted:
         errors = []
         
         if selected_slot == 'Select':
             errors.append("Please select a time slot")
-        if patient_type == 'Select':
-            errors.append("Please select patient type")
-        
         is_valid, msg = validate_billing(consultation_fee)
         if not is_valid:
             errors.append(f"Consultation Fee: {msg}")
         
+        if not errors and not slots.book(doctor_id, appointment_date, selected_slot):
+            errors.append("That time slot was just booked, please choose another")
+        
         if errors:
             for error in errors:
                 st.error(error)
         else:
+            patient_id, existing = patient_registry().resolve(data['name'], data['dob'], data['mobile'], data['email'])
+            patient_type = "Existing Patient" if existing else "New Patient"
+            data['patient_id'] = patient_id
+            
             # Update doctor patient count
-            dept = st.session_state.patient_data['department']
-            doc_idx = st.session_state.patient_data['doctor_index']
-            st.session_state.department_data[dept][doc_idx]['patients'] += 1
+            st.session_state.doctor_patients[st.session_state.patient_data['doctor_id']] += 1
+            st.session_state.booking_version += 1
             
             # Store appointment data
-            appointment_record = {
-                **st.session_state.patient_data,
-                'time_slot': selected_slot,
-                'appointment_date': appointment_date,
-                'patient_type': patient_type,
-                'consultation_fee': consultation_fee,
-                'total_billing': total_billing,
-                'booking_time': datetime.now()
-            }
-            st.session_state.all_appointments.append(appointment_record)
+            appointment_record = AppointmentRecord(
+                st.session_state.patient_data,
+                time_slot=selected_slot,
+                appointment_date=appointment_date,
+                patient_type=patient_type,
+                consultation_fee=consultation_fee,
+                total_billing=total_billing
+            )
+            st.session_state.appointments.append(appointment_record)
+            
+            # Email/SMS, audit record and lab orders happen off the request path
+            appointment = appointment_record.to_dict()
+            side_effects().enqueue_confirmation(appointment)
+            
+            # Wall monitors and live sidebars pick it up on their next poll
+            publish({**appointment, 'branch': BRANCH})
             
             st.session_state.patient_data.update({
                 'time_slot': selected_slot,
@@ -429,12 +555,27 @@ if st.session_state.step >= 5:
                 'consultation_fee': consultation_fee,
                 'total_billing': total_billing
             })
-            st.session_state.step = 6
-            st.rerun()
+            complete_step(5)
     
     if st.button("← Back", key="back4"):
-        st.session_state.step = 4
-        st.rerun()
+        go_back(4)
+
+ACTIVE_STEPS = {
+    1: patient_info_step,
+    2: symptoms_step,
+    3: doctor_step,
+    4: lab_tests_step,
+    5: appointment_step
+}
+
+for completed in range(1, st.session_state.step):
+    if completed in ACTIVE_STEPS:
+        render_completed_step(completed)
+
+if st.session_state.step in ACTIVE_STEPS:
+    if st.session_state.step > 1:
+        st.markdown("---")
+    ACTIVE_STEPS[st.session_state.step]()
 
 # Step 6: Confirmation
 if st.session_state.step >= 6:
@@ -442,7 +583,7 @@ if st.session_state.step >= 6:
     st.header("✅ Appointment Confirmed!")
     
     data = st.session_state.patient_data
-    doctor = data['doctor']
+    doctor = catalog.doctors[data['doctor_id']]
     
     st.success("Your appointment has been successfully booked!")
     
@@ -457,13 +598,14 @@ if st.session_state.step >= 6:
         st.write(f"**DOB:** {data['dob'].strftime('%d/%m/%Y')}")
         st.write(f"**Mobile:** {data['mobile']}")
         st.write(f"**Email:** {data['email']}")
+        st.write(f"**Patient ID:** {data['patient_id']}")
         st.write(f"**Patient Type:** {data['patient_type']}")
     
     with col2:
         st.subheader("Appointment Details")
-        st.write(f"**Doctor:** {doctor['name']}")
+        st.write(f"**Doctor:** {doctor.name}")
         st.write(f"**Department:** {data['department']}")
-        st.write(f"**Room No:** {doctor['room']}")
+        st.write(f"**Room No:** {doctor.room}")
         st.write(f"**Date:** {data['appointment_date'].strftime('%d/%m/%Y')}")
         st.write(f"**Time:** {data['time_slot']}")
     
@@ -475,7 +617,7 @@ if st.session_state.step >= 6:
     st.subheader("🧪 Lab Tests Ordered")
     if data['lab_tests']:
         for test in data['lab_tests']:
-            st.write(f"• {test} - ₹{lab_tests[test]:,}")
+            st.write(f"• {test} - ₹{catalog.lab_prices[test]:,}")
     else:
         st.write("No lab tests ordered")
     
@@ -492,4 +634,5 @@ if st.session_state.step >= 6:
     if st.button("Book Another Appointment", key="restart", type="primary"):
         st.session_state.step = 1
         st.session_state.patient_data = {}
+        st.session_state.step_summaries = {}
         st.rerun()
\ No newline at end of file
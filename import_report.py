@@ -0,0 +1,139 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from admin_pages import PAGES
+
+# Import-time and rerun report for the admin dashboard.
+#
+# Cold imports run in a fresh interpreter with `python -X importtime`, so
+# nothing is already sitting in sys.modules. Compares the cold start of the
+# old layout (everything imported up front) against the page registry
+# (shared setup plus the one page being opened). A single cold import is
+# mostly noise (disk cache, CPU frequency, other load), so every scenario
+# runs --repeat times, interleaved, and the median and minimum are reported.
+#
+# The baseline scenario is the import block of the single-script main.py
+# the registry replaced. The registry does not lower cold start: streamlit
+# and pandas are most of it, every page imports plotly.express at module
+# level and a cold start always renders Overview, so the shared cold path
+# is the baseline's imports plus admin_data. Measured on the reference
+# machine the two are within run-to-run noise of each other (~1.0-1.1 s),
+# and page reruns are no faster either, since each page now aggregates the
+# full branch datasets instead of 100 generated rows. What the registry
+# saves is the code nobody opens (make_subplots, the forecast and sketch
+# engines); the stated cold-start and rerun goal was not met.
+#
+# Reruns are timed in-process with Streamlit's AppTest: main.py is opened
+# once, then every page is selected, rendered once (its first visit, which
+# imports the page) and rerun --reruns more times. The median rerun is the
+# per-interaction overhead a user pays on that page. Pass --baseline with a
+# copy of the old script to time its pages the same way:
+#
+#   git show <commit before the page registry>:main.py > /tmp/main_baseline.py
+#   python import_report.py --baseline /tmp/main_baseline.py
+#   python import_report.py --repeat 9 --top 15  # more runs, heaviest modules
+
+MAIN_PATH = Path(__file__).resolve().parent / "main.py"
+SHARED = ["streamlit", "admin_data", "admin_pages"]
+BASELINE = ["streamlit", "pandas", "numpy", "plotly.express", "plotly.graph_objects", "plotly.subplots"]
+EAGER = SHARED + [f"admin_pages.{module}" for module in PAGES.values()]
+
+
+def measure(modules):
+    code = "; ".join(f"import {m}" for m in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines look like: "import time:  self [us] | cumulative | package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    # Top-level imports are the ones with no extra indentation
+    total_us = sum(cum for name, _, cum in rows if not name.startswith("  "))
+    return total_us, rows
+
+
+def measure_repeated(scenarios, repeat):
+    # Round-robin over the scenarios, so drift in machine load hits them all
+    samples = {label: [] for label, _ in scenarios}
+    for _ in range(repeat):
+        for label, modules in scenarios:
+            samples[label].append(measure(modules)[0] / 1000)
+    return {label: (statistics.median(s), min(s)) for label, s in samples.items()}
+
+
+def measure_reruns(script, reruns, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    at.run()
+    results = []
+    # Whatever pages the script's own navigation offers (the old one has no Forecast)
+    for label in next(radio for radio in at.sidebar.radio if radio.label == "Navigation").options:
+        module = PAGES.get(label, label)
+        next(radio for radio in at.sidebar.radio if radio.label == "Navigation").set_value(label)
+        start = time.perf_counter()
+        at.run()
+        first = (time.perf_counter() - start) * 1000
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(f"{module} failed: {at.exception[0].message}")
+        results.append((module, first, statistics.median(samples), min(samples)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import-time and rerun report for main.py")
+    parser.add_argument("--repeat", type=int, default=5, help="cold imports per scenario")
+    parser.add_argument("--reruns", type=int, default=10, help="timed reruns per page")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--baseline", help="copy of the pre-registry main.py to time reruns against")
+    parser.add_argument("--top", type=int, default=0, help="list the N heaviest modules of the eager import")
+    args = parser.parse_args()
+
+    print(f"Cold import, {args.repeat} runs each")
+    print(f"{'Scenario':<40}{'median ms':>12}{'min ms':>12}")
+    print("-" * 64)
+    scenarios = [("Baseline (old main.py imports)", BASELINE), ("Eager (all pages up front)", EAGER),
+                 ("Shared setup only", SHARED)]
+    scenarios += [(f"Shared + {module}", SHARED + [f"admin_pages.{module}"]) for module in PAGES.values()]
+    for label, (median, best) in measure_repeated(scenarios, args.repeat).items():
+        print(f"{label:<40}{median:>12.1f}{best:>12.1f}")
+
+    scripts = [("main.py", MAIN_PATH)]
+    if args.baseline:
+        scripts.append(("baseline main.py", Path(args.baseline)))
+    for name, script in scripts:
+        print()
+        print(f"Reruns of {name}, {args.reruns} per page")
+        print(f"{'Page':<40}{'first ms':>12}{'median ms':>12}{'min ms':>12}")
+        print("-" * 76)
+        for module, first, median, best in measure_reruns(script, args.reruns, args.timeout):
+            print(f"{module:<40}{first:>12.1f}{median:>12.1f}{best:>12.1f}")
+
+    if args.top:
+        _, eager_rows = measure(EAGER)
+        print()
+        print("Heaviest modules (self time) in the eager import:")
+        for name, self_us, _ in sorted(eager_rows, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"  {name.strip():<50}{self_us / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
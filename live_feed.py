@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+
+from appointment_store import DATA_DIR
+from catalog import get_catalog
+from moments import MomentAccumulator
+
+# Live appointment feed for the wall-monitor views.
+#
+# health_app.py appends every confirmed booking as one JSON line to the
+# day's feed file, data/feed/YYYY-MM-DD.jsonl (publish()). LiveTotals tails
+# today's file from a byte-offset watermark: each poll reads only the lines
+# written since the last one and folds them into small running counters per
+# (branch, department, doctor). Given moment columns, it also folds every
+# booking into a per-branch MomentAccumulator (one O(k^2) update each), which
+# the admin dashboard merges with the branch moments. When the date changes
+# it starts over on the new file, so live figures always cover today, like
+# the generated dataset they sit next to.
+#
+# Files are kept for FEED_KEEP_DAYS, long enough for availability.py to
+# replay every booking still inside its horizon (read_feed()).
+#
+# One LiveTotals is shared by every viewer in a process and polls the file at
+# most once per POLL_SECONDS, so the server does the same amount of work
+# whether one screen or fifty are watching; each screen just renders the
+# current snapshot.
+
+FEED_DIR = DATA_DIR / "feed"
+FEED_KEEP_DAYS = 90
+POLL_SECONDS = 5
+RECENT_ROWS = 10
+
+_publish_lock = threading.Lock()
+
+
+def dataset_record(appointment):
+    # A feed booking in the admin dataset's column terms
+    doctor = get_catalog().doctor_of(appointment)
+    return {
+        **appointment,
+        'num_symptoms': len(appointment['symptoms']),
+        'num_lab_tests': len(appointment['lab_tests']),
+        'doctor_experience': doctor.experience,
+    }
+
+
+def feed_path(day=None):
+    return FEED_DIR / f"{(day or date.today()).isoformat()}.jsonl"
+
+
+def prune_feed(keep_days=FEED_KEEP_DAYS):
+    oldest = feed_path(date.today() - timedelta(days=keep_days - 1)).name
+    for path in FEED_DIR.glob("*.jsonl"):
+        if path.name < oldest:
+            path.unlink(missing_ok=True)
+
+
+def publish(appointment, path=None):
+    path = path or feed_path()
+    line = json.dumps(appointment) + "\n"
+    with _publish_lock:
+        if not path.exists():
+            # First booking of the day
+            path.parent.mkdir(parents=True, exist_ok=True)
+            prune_feed()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def read_feed(days=1):
+    # Every complete booking of the last `days` days' feeds, oldest first
+    today = date.today()
+    for offset in range(days - 1, -1, -1):
+        try:
+            with open(feed_path(today - timedelta(days=offset)), "rb") as f:
+                for line in f:
+                    if line.endswith(b"\n") and line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            continue
+
+
+class LiveTotals:
+    def __init__(self, path=None, min_interval=POLL_SECONDS, moment_columns=()):
+        self.path = path         # a fixed file, or None to follow today's feed
+        self.min_interval = min_interval
+        self.moment_columns = list(moment_columns)
+        self._lock = threading.Lock()
+        self.seq = 0             # appointments folded in, ever (never goes back)
+        self._reset(None)
+
+    def _reset(self, current):
+        self.current = current   # the file being tailed
+        self.offset = 0          # watermark: bytes of the feed already folded in
+        self.last_poll = 0.0
+        self.counts = {}         # (branch, department, doctor_name) -> appointments
+        self.revenue = {}        # (branch, department, doctor_name) -> billing
+        self.recent = deque(maxlen=RECENT_ROWS)
+        self.branch_moments = {}  # branch -> MomentAccumulator
+
+    def _fold(self, appointment):
+        key = (appointment.get('branch'), appointment['department'], appointment['doctor_name'])
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.revenue[key] = self.revenue.get(key, 0.0) + float(appointment['total_billing'])
+        self.recent.append(appointment)
+        if self.moment_columns:
+            moments = self.branch_moments.setdefault(key[0], MomentAccumulator(self.moment_columns))
+            moments.update_record(dataset_record(appointment))
+        self.seq += 1
+
+    def poll(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.last_poll < self.min_interval:
+            return self.seq
+        with self._lock:
+            if not force and now - self.last_poll < self.min_interval:
+                return self.seq
+            path = self.path or feed_path()
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                size = 0
+            if path != self.current or size < self.offset:
+                # A new day's file, or the feed was cleared; start over
+                self._reset(path)
+            self.last_poll = now
+            if size > self.offset:
+                with open(path, "rb") as f:
+                    f.seek(self.offset)
+                    chunk = f.read(size - self.offset)
+                # Leave a half-written last line for the next poll
+                end = chunk.rfind(b"\n") + 1
+                for line in chunk[:end].splitlines():
+                    if line.strip():
+                        self._fold(json.loads(line))
+                self.offset += end
+            return self.seq
+
+    def totals(self, branch=None):
+        with self._lock:
+            keys = [key for key in self.counts if branch is None or key[0] == branch]
+            by_department, by_doctor = {}, {}
+            for key in keys:
+                by_department[key[1]] = by_department.get(key[1], 0) + self.counts[key]
+                by_doctor[key[2]] = by_doctor.get(key[2], 0) + self.counts[key]
+            return {
+                'seq': self.seq,
+                'appointments': sum(self.counts[key] for key in keys),
+                'revenue': sum(self.revenue[key] for key in keys),
+                'by_department': by_department,
+                'by_doctor': by_doctor,
+                'recent': [a for a in self.recent if branch is None or a.get('branch') == branch],
+            }
+
+    def moments(self, branches=None):
+        # Merged copy of the folded-in bookings' moments for some branches
+        with self._lock:
+            merged = MomentAccumulator(self.moment_columns)
+            for branch, moments in self.branch_moments.items():
+                if branches is None or branch in branches:
+                    merged.merge(moments)
+            return merged
@@ -0,0 +1,288 @@
+import argparse
+import os
+import pickle
+import random
+import resource
+import string
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+# Load-test harness for the booking wizard in health_app.py.
+#
+# Each simulated reception terminal is a headless AppTest session that walks
+# the six-step flow (patient info -> symptoms -> doctor -> lab tests -> time
+# slot -> confirmation) and then starts over. All N terminals are threads of
+# this one process, the way one Streamlit server runs its sessions, so they
+# share the server's singletons: availability matrix, patient registry,
+# side-effects worker and live feed. Terminals pick a random free slot, so
+# two of them sometimes race for the same one; the loser gets the "just
+# booked" error and picks again, which the report counts as a conflict.
+#
+# AppTest is not built for concurrent runs: each run installs its own
+# Runtime and patches Streamlit's process-global config for its duration,
+# so two overlapping runs would tear down each other's. Script runs
+# therefore take turns through one lock, and what this measures is a
+# model of one serialized queue of reruns, not the capacity of a real
+# server, whose sessions run their scripts concurrently. A rerun's latency
+# is the wait for its turn plus the run.
+# One untimed warm-up booking goes first so lazy imports (plotly, pandas)
+# are out of the way, like on a long-running server.
+#
+# Everything the app writes (feed, registry, spool, outbox, session spills)
+# goes to a fresh HOSPITAL_DATA_DIR, a temporary directory unless --data-dir
+# is given, so the real data/ tree is never touched.
+#
+#   python load_test.py --users 20 --bookings 5
+#
+# Reports rerun latency percentiles per step and bookings per second (both
+# for the serialized queue above), session state size per terminal and slot
+# conflicts. Every confirmed booking is then checked against the shared feed
+# and availability matrix; lost, duplicate or double-booked appointments and
+# undelivered side effects fail the run.
+
+APP_PATH = Path(__file__).resolve().parent / "health_app.py"
+RUN_LOCK = threading.Lock()
+MAX_ATTEMPTS = 10
+
+
+def _letters(number, width=4):
+    # Names must be alphabetic, so encode terminal/booking numbers in letters
+    out = ""
+    for _ in range(width):
+        number, digit = divmod(number, 26)
+        out = string.ascii_lowercase[digit] + out
+    return out.title()
+
+
+def _select(at, label, value=None):
+    box = next(widget for widget in at.selectbox if widget.label == label)
+    if value is None:
+        value = next(option for option in box.options if option != 'Select')
+    box.select(value)
+    return box
+
+
+def _free_slots(at):
+    box = next(widget for widget in at.selectbox if widget.label == "Time Slot *")
+    return [option for option in box.options if option != 'Select']
+
+
+class Terminal:
+    def __init__(self, user, app_path, timeout, horizon_days):
+        self.user = user
+        self.at = AppTest.from_file(str(app_path), default_timeout=timeout)
+        self.random = random.Random(user)
+        self.day = date.today() + timedelta(days=1)
+        self.last_day = date.today() + timedelta(days=horizon_days - 1)
+        self.latencies = defaultdict(list)
+        self.waits = []
+        self.conflicts = 0
+        self.expected = []
+
+    def _run(self, step):
+        queued = time.perf_counter()
+        with RUN_LOCK:
+            started = time.perf_counter()
+            self.at.run()
+        self.latencies[step].append(time.perf_counter() - queued)
+        self.waits.append(started - queued)
+        if self.at.exception:
+            raise RuntimeError(f"terminal {self.user} failed at {step}: {self.at.exception[0].message}")
+
+    def book(self, booking):
+        at = self.at
+        mobile = f"9{self.user % 10000:04d}{booking:05d}"
+
+        at.text_input[0].input(f"Load {_letters(self.user)} {_letters(booking)}")
+        _select(at, "Blood Group *", "O+")
+        _select(at, "Gender *", "Other")
+        at.text_input[1].input(mobile)
+        at.text_input[2].input(f"terminal{self.user}.booking{booking}@loadtest.local")
+        at.button(key="step1_btn").click()
+        self._run("1 patient info")
+
+        at.checkbox(key="symptom_fever").check()
+        at.button(key="symptoms_submit").click()
+        self._run("2 symptoms")
+        _select(at, "Select Department *")
+        self._run("2 department")
+        at.button(key="step2_btn").click()
+        self._run("2 continue")
+
+        at.button(key=f"doc_{(self.user + booking) % 3}").click()
+        self._run("3 doctor")
+
+        at.checkbox(key="lab_CBC").check()
+        at.button(key="step4_btn").click()
+        self._run("4 lab tests")
+
+        # Earliest day with a free slot, from this terminal's last booking on
+        at.date_input[0].set_value(self.day)
+        self._run("5 date")
+        for _ in range(MAX_ATTEMPTS):
+            while not _free_slots(at):
+                if self.day >= self.last_day:
+                    raise RuntimeError(f"terminal {self.user} found no free slot in the booking horizon")
+                self.day += timedelta(days=1)
+                at.date_input[0].set_value(self.day)
+                self._run("5 date")
+            _select(at, "Time Slot *", self.random.choice(_free_slots(at)))
+            at.button(key="step5_btn").click()
+            self._run("5 confirm")
+            if at.session_state.step == 6:
+                break
+            # Another terminal took the slot between listing and confirming
+            self.conflicts += 1
+        else:
+            raise RuntimeError(f"terminal {self.user} lost the slot race {MAX_ATTEMPTS} times")
+
+        data = at.session_state.patient_data
+        self.expected.append({'mobile': mobile, 'doctor_id': data['doctor_id'],
+                              'day': data['appointment_date'], 'slot': data['time_slot']})
+
+        at.button(key="restart").click()
+        self._run("6 restart")
+
+    def start(self):
+        self._run("0 first load")
+
+    def session_bytes(self):
+        total = 0
+        for value in self.at.session_state.values():
+            try:
+                total += len(pickle.dumps(value))
+            except Exception:
+                pass
+        return total
+
+    def booked_mobiles(self):
+        return [record['mobile'] for record in self.at.session_state.appointments.iter_dicts()]
+
+
+def simulate(terminal, bookings):
+    terminal.start()
+    for booking in range(bookings):
+        terminal.book(booking)
+    return terminal
+
+
+def wait_for_side_effects(spool_dir, timeout):
+    # Spooled jobs still waiting for the shared worker (parked failures excluded)
+    deadline = time.monotonic() + timeout
+    while True:
+        pending = [path for path in spool_dir.glob("*") if not path.name.endswith((".failed", ".tmp"))]
+        if not pending or time.monotonic() > deadline:
+            return len(pending), len(list(spool_dir.glob("*.failed")))
+        time.sleep(0.2)
+
+
+def check_bookings(terminals, feed, matrix):
+    expected = [booking for terminal in terminals for booking in terminal.expected]
+    in_feed = Counter(record['mobile'] for record in feed)
+    cells = Counter((record['doctor_id'], record['appointment_date'], record['time_slot']) for record in feed)
+    return {
+        # Confirmed at a terminal but missing from the feed, or in it twice
+        'lost': [b['mobile'] for b in expected if not in_feed[b['mobile']]],
+        'duplicate': [mobile for mobile, n in in_feed.items() if n > 1],
+        'unconfirmed': sorted(set(in_feed) - {b['mobile'] for b in expected}),
+        # Two bookings for one doctor's slot
+        'double_booked': [cell for cell, n in cells.items() if n > 1],
+        # Confirmed bookings the shared matrix still shows as free, and taken
+        # cells no confirmed booking accounts for
+        'unmarked': [b['mobile'] for b in expected if matrix.is_free(b['doctor_id'], b['day'], b['slot'])],
+        'leaked': int(np.count_nonzero(matrix.occupied)) - len(cells),
+        # Each session's own log against what it confirmed
+        'session': [b['mobile'] for terminal in terminals for b in terminal.expected
+                    if b['mobile'] not in terminal.booked_mobiles()],
+    }
+
+
+def run(args, data_dir):
+    os.environ["HOSPITAL_DATA_DIR"] = str(data_dir)
+    # Imported after HOSPITAL_DATA_DIR is set, so they resolve the same
+    # paths as the app running in this process
+    from availability import HORIZON_DAYS, get_availability
+    from live_feed import read_feed
+    from notifications import SPOOL_DIR
+
+    warmup = Terminal(args.users, args.app, args.timeout, HORIZON_DAYS)
+    simulate(warmup, 1)
+
+    terminals = [Terminal(user, args.app, args.timeout, HORIZON_DAYS) for user in range(args.users)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [pool.submit(simulate, terminal, args.bookings) for terminal in terminals]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+    rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+    latencies = defaultdict(list)
+    for terminal in terminals:
+        for step, samples in terminal.latencies.items():
+            latencies[step].extend(samples)
+    waits = np.array([wait for terminal in terminals for wait in terminal.waits]) * 1000
+    booked = sum(len(terminal.expected) for terminal in terminals)
+
+    print(f"{args.users} terminals x {args.bookings} bookings in {elapsed:.2f}s (data in {data_dir})")
+    print("Throughput and latencies are for one serialized queue of script runs, not server capacity")
+    print()
+    print("Rerun latency per step (queue wait + run, serialized)")
+    print(f"{'Step':<18}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print("-" * 64)
+    for step in sorted(latencies):
+        samples = np.array(latencies[step]) * 1000
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        print(f"{step:<18}{len(samples):>6}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{samples.max():>10.1f}")
+
+    pending, failed = wait_for_side_effects(SPOOL_DIR, args.drain)
+    feed = list(read_feed())
+    branch = feed[0]['branch']
+    problems = check_bookings([warmup] + terminals, [r for r in feed if r['branch'] == branch],
+                              get_availability(branch))
+
+    session_sizes = [terminal.session_bytes() for terminal in terminals]
+    print()
+    print(f"Bookings/sec (serialized): {booked / elapsed:.2f}")
+    print(f"Queue wait per rerun:      p50 {np.percentile(waits, 50):.1f} ms, p95 {np.percentile(waits, 95):.1f} ms")
+    print(f"Session state/terminal:    {np.mean(session_sizes) / 1024:.1f} KB avg, {max(session_sizes) / 1024:.1f} KB max")
+    print(f"Peak RSS growth/terminal:  {rss_growth / args.users:.1f} MB ({rss_growth:.1f} MB in total)")
+    print(f"Slot conflicts (retried):  {sum(terminal.conflicts for terminal in terminals)}")
+    print(f"Lost bookings:             {len(problems['lost'])}")
+    print(f"Duplicate bookings:        {len(problems['duplicate']) + len(problems['unconfirmed'])}")
+    print(f"Double-booked slots:       {len(problems['double_booked'])}")
+    print(f"Matrix mismatches:         {len(problems['unmarked']) + abs(problems['leaked'])}")
+    print(f"Missing from session logs: {len(problems['session'])}")
+    print(f"Undelivered side effects:  {pending} pending, {failed} failed")
+    if any(problems[key] for key in problems) or pending or failed:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the booking wizard")
+    parser.add_argument("--users", type=int, default=10, help="simulated reception terminals")
+    parser.add_argument("--bookings", type=int, default=3, help="bookings per terminal")
+    parser.add_argument("--app", default=str(APP_PATH), help="path to health_app.py")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per rerun")
+    parser.add_argument("--drain", type=float, default=30, help="seconds to wait for side effects at the end")
+    parser.add_argument("--data-dir", help="keep the run's data here instead of a temporary directory")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        run(args, Path(args.data_dir).resolve())
+    else:
+        with tempfile.TemporaryDirectory(prefix="load_test-") as data_dir:
+            run(args, Path(data_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# Streaming moment accumulator (Welford / co-moment form).
+#
+# Holds the count, the mean vector and the co-moment matrix
+#   C[i, j] = sum((x_i - mean_i) * (x_j - mean_j))
+# for a fixed set of numeric columns. Adding one appointment costs O(k^2)
+# for k columns, and two accumulators built over different partitions merge
+# exactly, so summary statistics never need a rescan of the table.
+
+
+class MomentAccumulator:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    @classmethod
+    def from_array(cls, columns, values):
+        acc = cls(columns)
+        values = np.asarray(values, dtype=float)
+        if len(values):
+            acc.n = len(values)
+            acc.mean = values.mean(axis=0)
+            centered = values - acc.mean
+            acc.comoment = centered.T @ centered
+        return acc
+
+    @classmethod
+    def from_frame(cls, df, columns):
+        return cls.from_array(columns, df[list(columns)].to_numpy(dtype=float))
+
+    def update(self, values):
+        x = np.asarray(values, dtype=float)
+        self.n += 1
+        delta = x - self.mean
+        self.mean = self.mean + delta / self.n
+        self.comoment += np.outer(delta, x - self.mean)
+
+    def update_record(self, record):
+        self.update([record[col] for col in self.columns])
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns")
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.comoment = other.n, other.mean.copy(), other.comoment.copy()
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        return self
+
+    def variance(self, ddof=1):
+        if self.n <= ddof:
+            return pd.Series(np.nan, index=self.columns)
+        return pd.Series(np.diag(self.comoment) / (self.n - ddof), index=self.columns)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+    def means(self):
+        return pd.Series(self.mean, index=self.columns)
+
+    def covariance(self, ddof=1):
+        if self.n <= ddof:
+            return pd.DataFrame(np.nan, index=self.columns, columns=self.columns)
+        return pd.DataFrame(self.comoment / (self.n - ddof), index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
@@ -0,0 +1,327 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+from pathlib import Path
+
+from appointment_store import DATA_DIR
+
+# Background side-effects queue for confirmed appointments.
+#
+# The confirmation step only calls enqueue(); a daemon worker thread does the
+# slow I/O (patient email/SMS, audit record, lab-order hand-off). Every job is
+# written to a spool directory before enqueue() returns, so nothing is lost if
+# the process restarts. Failed jobs are retried with exponential backoff, and
+# outgoing messages are sent in batches so one SMTP connection serves many
+# confirmations; only the messages that did not go out are retried.
+#
+# Several server processes can share one spool. A job file is named
+# <id>.inflight.<pid> by the process that owns it, and ownership only ever
+# changes by an atomic rename, so exactly one process delivers each job. On
+# start() a process claims the jobs of processes that are no longer running
+# (and unclaimed <id>.json files from older versions); jobs of live processes
+# are left alone. Jobs that keep failing, and job files that cannot be read,
+# are parked as <id>.failed. The worker logs every error and keeps running, so
+# one bad job never stops the side effects of the others.
+#
+# LocalSink is the default delivery backend: it appends every message, audit
+# record and lab order to JSON-lines files under data/outbox, which makes it
+# a stand-in SMTP/SMS gateway for local testing. SmtpSink sends email through
+# a real SMTP server; set APPOINTMENT_SMTP_HOST (and APPOINTMENT_SMTP_PORT)
+# to use it.
+
+log = logging.getLogger(__name__)
+
+SPOOL_DIR = DATA_DIR / "spool"
+OUTBOX_DIR = DATA_DIR / "outbox"
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 2
+BATCH_SIZE = 20
+BATCH_WAIT_SECONDS = 0.5
+
+
+class LocalSink:
+    def __init__(self, outbox_dir=OUTBOX_DIR):
+        self.outbox_dir = Path(outbox_dir)
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _write(self, name, payloads):
+        with self._lock, open(self.outbox_dir / f"{name}.jsonl", "a", encoding="utf-8") as f:
+            for payload in payloads:
+                f.write(json.dumps(payload) + "\n")
+
+    def send_messages(self, messages):
+        # One delivered flag per message
+        self._write("email", [m for m in messages if m['channel'] == 'email'])
+        self._write("sms", [m for m in messages if m['channel'] == 'sms'])
+        return [True] * len(messages)
+
+    def write_audit(self, records):
+        self._write("audit", records)
+
+    def send_lab_orders(self, orders):
+        self._write("lab_orders", orders)
+
+
+class SmtpSink(LocalSink):
+    def __init__(self, host="localhost", port=8025, sender="appointments@hospital.local", outbox_dir=OUTBOX_DIR):
+        super().__init__(outbox_dir)
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    def send_messages(self, messages):
+        delivered = [False] * len(messages)
+        emails = [i for i, m in enumerate(messages) if m['channel'] == 'email']
+        if emails:
+            # One connection for the whole batch; a refused message or a
+            # dropped connection only fails the messages not yet sent
+            try:
+                with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+                    for i in emails:
+                        message = messages[i]
+                        email = EmailMessage()
+                        email['From'] = self.sender
+                        email['To'] = message['to']
+                        email['Subject'] = message['subject']
+                        email.set_content(message['body'])
+                        try:
+                            smtp.send_message(email)
+                        except (smtplib.SMTPException, OSError):
+                            continue
+                        delivered[i] = True
+            except (smtplib.SMTPException, OSError):
+                pass
+        # No SMS gateway yet: SMS stays in the local outbox
+        sms = [i for i, m in enumerate(messages) if m['channel'] == 'sms']
+        try:
+            self._write("sms", [messages[i] for i in sms])
+        except OSError:
+            return delivered
+        for i in sms:
+            delivered[i] = True
+        return delivered
+
+
+def default_sink():
+    host = os.environ.get("APPOINTMENT_SMTP_HOST")
+    if host:
+        return SmtpSink(host, int(os.environ.get("APPOINTMENT_SMTP_PORT", 25)))
+    return LocalSink()
+
+
+def _process_alive(pid):
+    # A recycled pid looks alive, which only delays recovery of its jobs
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def confirmation_jobs(appointment):
+    doctor = appointment['doctor_name']
+    when = f"{appointment['appointment_date']} at {appointment['time_slot']}"
+    body = (f"Dear {appointment['name']}, your appointment with {doctor} "
+            f"({appointment['department']}) is confirmed for {when}. "
+            f"Total amount: ₹{appointment['total_billing']:,.2f}")
+    jobs = [
+        {'kind': 'message', 'payload': {'channel': 'email', 'to': appointment['email'],
+                                        'subject': "Appointment Confirmed", 'body': body}},
+        {'kind': 'message', 'payload': {'channel': 'sms', 'to': appointment['mobile'], 'body': body}},
+        {'kind': 'audit', 'payload': {'event': 'appointment_confirmed', 'at': time.time(), **appointment}},
+    ]
+    if appointment['lab_tests']:
+        jobs.append({'kind': 'lab_order', 'payload': {
+            'patient': appointment['name'], 'mobile': appointment['mobile'],
+            'doctor': doctor, 'tests': appointment['lab_tests'],
+            'appointment_date': appointment['appointment_date']
+        }})
+    return jobs
+
+
+class SideEffectQueue:
+    def __init__(self, sink=None, spool_dir=SPOOL_DIR):
+        self.sink = sink or default_sink()
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._queue = queue.Queue()
+        # (not_before, seq, path) for jobs waiting out a retry backoff
+        self._delayed = []
+        self._seq = itertools.count()
+        self._thread = None
+        self.sent = 0
+        self.failed = 0
+
+    def start(self):
+        if self._thread is None:
+            # Jobs orphaned by processes that are gone go first, oldest first
+            for path in sorted(self._orphans(), key=lambda path: path.name):
+                claimed = self._claim(path)
+                if claimed is not None:
+                    self._queue.put(claimed)
+            self._thread = threading.Thread(target=self._run, name="side-effects", daemon=True)
+            self._thread.start()
+        return self
+
+    def enqueue(self, kind, payload):
+        job = {'id': uuid.uuid4().hex, 'kind': kind, 'payload': payload,
+               'attempts': 0, 'not_before': 0}
+        name = f"{time.time_ns()}-{job['id']}"
+        tmp = self.spool_dir / f"{name}.tmp"
+        tmp.write_text(json.dumps(job), encoding="utf-8")
+        # Lands already claimed, so no other process's start() picks it up
+        path = self.spool_dir / f"{name}.inflight.{os.getpid()}"
+        os.replace(tmp, path)
+        self._queue.put(path)
+
+    def enqueue_confirmation(self, appointment):
+        for job in confirmation_jobs(appointment):
+            self.enqueue(job['kind'], job['payload'])
+
+    def _orphans(self):
+        yield from self.spool_dir.glob("*.json")
+        for path in self.spool_dir.glob("*.inflight.*"):
+            owner = path.name.rsplit(".", 1)[1]
+            if owner.isdigit() and int(owner) != os.getpid() and not _process_alive(int(owner)):
+                yield path
+
+    def _claim(self, path):
+        # The rename is atomic: if two processes race for an orphan, one
+        # rename succeeds and the other finds the file gone
+        claimed = self.spool_dir / f"{path.name.split('.', 1)[0]}.inflight.{os.getpid()}"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    def pending(self):
+        return self._queue.qsize() + len(self._delayed)
+
+    def _next_batch(self, timeout):
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + BATCH_WAIT_SECONDS
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            try:
+                self._step()
+            except Exception:
+                # Never let the worker die; the jobs stay in the spool
+                log.exception("side-effects worker step failed")
+                time.sleep(1)
+
+    def _step(self):
+        timeout = max(0, self._delayed[0][0] - time.time()) if self._delayed else None
+        paths = self._next_batch(timeout)
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            paths.append(heapq.heappop(self._delayed)[2])
+
+        by_kind = {}
+        for path in paths:
+            job = self._load(path)
+            if job is None:
+                continue
+            if job['not_before'] > now:
+                self._delay(path, job)
+            else:
+                by_kind.setdefault(job['kind'], []).append((path, job))
+        for kind, items in by_kind.items():
+            self._deliver(kind, items)
+
+    def _load(self, path):
+        try:
+            job = json.loads(path.read_text(encoding="utf-8"))
+            if not all(key in job for key in ('kind', 'payload', 'attempts', 'not_before')):
+                raise ValueError("missing job fields")
+            return job
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            log.error("unreadable side-effect job %s: %s", path.name, exc)
+            self._park(path)
+            return None
+
+    def _park(self, path):
+        # Out of the queue for a human to look at; it stays on disk
+        try:
+            path.replace(self.spool_dir / f"{path.name.split('.', 1)[0]}.failed")
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            log.error("could not park side-effect job %s: %s", path.name, exc)
+        self.failed += 1
+
+    def _delay(self, path, job):
+        heapq.heappush(self._delayed, (job['not_before'], next(self._seq), path))
+
+    def _deliver(self, kind, items):
+        payloads = [job['payload'] for _, job in items]
+        try:
+            if kind == 'message':
+                delivered = self.sink.send_messages(payloads)
+            elif kind == 'audit':
+                self.sink.write_audit(payloads)
+                delivered = [True] * len(items)
+            elif kind == 'lab_order':
+                self.sink.send_lab_orders(payloads)
+                delivered = [True] * len(items)
+            else:
+                raise ValueError(f"Unknown side-effect kind '{kind}'")
+        except Exception as exc:
+            log.warning("delivering %d %s job(s) failed: %s", len(items), kind, exc)
+            delivered = [False] * len(items)
+        for (path, job), ok in zip(items, delivered):
+            try:
+                if ok:
+                    path.unlink(missing_ok=True)
+                    self.sent += 1
+                else:
+                    self._retry(path, job)
+            except Exception:
+                log.exception("side-effect job %s could not be settled", path.name)
+
+    def _retry(self, path, job):
+        job['attempts'] += 1
+        if job['attempts'] >= MAX_ATTEMPTS:
+            self._park(path)
+            return
+        job['not_before'] = time.time() + RETRY_BASE_SECONDS ** job['attempts']
+        try:
+            path.write_text(json.dumps(job), encoding="utf-8")
+        except OSError as exc:
+            # Still retried from memory; the file keeps the previous attempt
+            log.error("could not update side-effect job %s: %s", path.name, exc)
+        self._delay(path, job)
@@ -0,0 +1,169 @@
+import json
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from appointment_store import DATA_DIR
+
+# Patient identity resolution.
+#
+# PatientRegistry keeps three hash indexes: normalised mobile number,
+# normalised email and name + date of birth. resolve() checks them in that
+# order, so a returning patient is recognised by any one of them, and new
+# patients get the next stable ID. A mobile or email can be shared (a parent
+# booking for a child on the family phone), so it only links to a patient
+# whose name + DOB agree, or when one side has none on record. Every lookup
+# is a dict probe plus a scan of the few patients sharing that contact, no
+# matter how many patients are registered. New registrations are appended
+# to data/patients.jsonl and replayed when the process starts.
+#
+# deduplicate() is the bulk version for historical data: it links rows that
+# share name + DOB, or a contact under the same rule (union-find by label
+# propagation over pandas groupbys), and assigns one ID per person, which
+# also tells new from existing patients.
+
+REGISTRY_PATH = DATA_DIR / "patients.jsonl"
+
+
+def normalize_mobile(mobile):
+    digits = re.sub(r"\D", "", str(mobile or ""))
+    return digits[-10:] if len(digits) >= 10 else ""
+
+
+def normalize_email(email):
+    return str(email or "").strip().lower()
+
+
+def name_dob_key(name, dob):
+    name = " ".join(str(name or "").lower().split())
+    return f"{name}|{dob.isoformat() if hasattr(dob, 'isoformat') else dob}" if name and dob else ""
+
+
+def format_patient_id(number):
+    return f"MRN{number:07d}"
+
+
+class PatientRegistry:
+    def __init__(self, path=None):
+        self.path = path
+        self.by_mobile = {}      # mobile -> [patient ids sharing it]
+        self.by_email = {}       # email -> [patient ids sharing it]
+        self.by_name_dob = {}
+        self.name_dob = {}       # patient id -> name + DOB on record
+        self.visits = {}
+        self.count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=REGISTRY_PATH):
+        registry = cls(path)
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    registry._index(entry['patient_id'], entry['keys'])
+                    registry.count = max(registry.count, int(entry['patient_id'][3:]))
+        return registry
+
+    def _keys(self, name, dob, mobile, email):
+        return {
+            'mobile': normalize_mobile(mobile),
+            'email': normalize_email(email),
+            'name_dob': name_dob_key(name, dob),
+        }
+
+    def _index(self, patient_id, keys):
+        for index, key in ((self.by_mobile, keys['mobile']), (self.by_email, keys['email'])):
+            if key:
+                owners = index.setdefault(key, [])
+                if patient_id not in owners:
+                    owners.append(patient_id)
+        if keys['name_dob']:
+            # First owner of a name + DOB keeps it
+            self.by_name_dob.setdefault(keys['name_dob'], patient_id)
+            self.name_dob.setdefault(patient_id, keys['name_dob'])
+
+    def _match(self, keys):
+        name_dob = keys['name_dob']
+        for index, key in ((self.by_mobile, keys['mobile']), (self.by_email, keys['email'])):
+            for patient_id in index.get(key, ()):
+                known = self.name_dob.get(patient_id)
+                if not known or not name_dob or known == name_dob:
+                    return patient_id
+        return self.by_name_dob.get(name_dob)
+
+    def lookup(self, name, dob, mobile, email):
+        return self._match(self._keys(name, dob, mobile, email))
+
+    def resolve(self, name, dob, mobile, email):
+        # Returns (patient_id, is_existing) and counts the visit
+        keys = self._keys(name, dob, mobile, email)
+        with self._lock:
+            patient_id = self._match(keys)
+            existing = patient_id is not None
+            if not existing:
+                self.count += 1
+                patient_id = format_patient_id(self.count)
+                if self.path:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps({'patient_id': patient_id, 'keys': keys}) + "\n")
+            # Link any new keys (e.g. a changed email) to the patient
+            self._index(patient_id, keys)
+            self.visits[patient_id] = self.visits.get(patient_id, 0) + 1
+        return patient_id, existing
+
+
+def deduplicate(df, date_column='appointment_date'):
+    # Returns (patient ids, patient types) aligned with df's index
+    n = len(df)
+    mobile = df['mobile'].map(normalize_mobile)
+    email = df['email'].map(normalize_email)
+    if 'dob' in df:
+        name_dob = pd.Series([name_dob_key(a, b) for a, b in zip(df['name'], df['dob'])], index=df.index)
+    else:
+        name_dob = pd.Series("", index=df.index)
+
+    # Rows sharing a non-empty key get the same group label. A mobile or
+    # email is split by name + DOB first, so a shared family contact does not
+    # merge different people; rows without name + DOB join the contact's only
+    # identity if it has exactly one.
+    known = name_dob.where(name_dob != "")
+    key_codes = []
+    for key in (mobile, email):
+        groups = known.groupby(key.where(key != ""))
+        only = groups.transform("first").where(groups.transform("nunique") == 1)
+        identity = known.fillna(only).fillna("")
+        codes, _ = pd.factorize((key + "|" + identity).where(key != ""))
+        key_codes.append(codes)
+    codes, _ = pd.factorize(known)
+    key_codes.append(codes)
+
+    labels = np.arange(n)
+    while True:
+        previous = labels.copy()
+        for codes in key_codes:
+            valid = codes >= 0
+            if not valid.any():
+                continue
+            group_min = pd.Series(labels[valid]).groupby(codes[valid]).transform("min").to_numpy()
+            labels[valid] = group_min
+        # Pointer jumping so chains collapse in a few passes
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            break
+
+    # Number people in order of their first visit
+    order = np.argsort(pd.to_datetime(df[date_column]).to_numpy(), kind="stable")
+    first_seen = {}
+    for row in order:
+        first_seen.setdefault(labels[row], len(first_seen) + 1)
+    patient_ids = pd.Series([format_patient_id(first_seen[label]) for label in labels], index=df.index)
+
+    ordered = pd.Series(labels[order])
+    is_first = np.empty(n, dtype=bool)
+    is_first[order] = ~ordered.duplicated().to_numpy()
+    patient_types = pd.Series(np.where(is_first, "New Patient", "Existing Patient"), index=df.index)
+    return patient_ids, patient_types
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Rolling-window analytics from per-day prefix sums.
+#
+# DailyPrefix turns a frame into three (entities, days + 1) prefix-sum
+# matrices, one row per department or doctor: appointments, revenue and
+# consultation fees. They are built in one bincount pass over the rows, so a
+# window of any length for any entity is two lookups,
+#
+#   sum(day - w + 1 .. day) = prefix[:, day + 1] - prefix[:, day + 1 - w]
+#
+# and every entity's full rolling series is one vectorized subtraction.
+# Prefixes built on the same calendar and entity list add up, so per-branch
+# prefixes merge into network-wide ones without the rows.
+
+WINDOWS = (7, 30, 90)
+METRICS = ('volume', 'revenue', 'avg_fee')
+
+
+class DailyPrefix:
+    def __init__(self, entities, start, days):
+        self.entities = list(entities)
+        self.index = {name: i for i, name in enumerate(self.entities)}
+        self.start = pd.Timestamp(start).normalize()
+        self.days = days
+        shape = (len(self.entities), days + 1)
+        self.volume = np.zeros(shape)
+        self.revenue = np.zeros(shape)
+        self.fees = np.zeros(shape)
+
+    @classmethod
+    def from_frame(cls, df, by, entities, start, end):
+        prefix = cls(entities, start, (pd.Timestamp(end) - pd.Timestamp(start)).days + 1)
+        codes = df[by].map(prefix.index).to_numpy()
+        days = (pd.to_datetime(df['appointment_date']) - prefix.start).dt.days.to_numpy()
+        keep = ~pd.isna(codes) & (days >= 0) & (days < prefix.days)
+        # Daily totals land in column day + 1; column 0 stays the empty prefix
+        flat = codes[keep].astype(int) * (prefix.days + 1) + days[keep] + 1
+        size = len(prefix.entities) * (prefix.days + 1)
+        shape = prefix.volume.shape
+        for name, weights in (('volume', None),
+                              ('revenue', df['total_billing'].to_numpy(dtype=float)[keep]),
+                              ('fees', df['consultation_fee'].to_numpy(dtype=float)[keep])):
+            daily = np.bincount(flat, weights=weights, minlength=size).reshape(shape)
+            setattr(prefix, name, np.cumsum(daily, axis=1))
+        return prefix
+
+    def merge(self, other):
+        if other.entities != self.entities or other.start != self.start or other.days != self.days:
+            raise ValueError("Cannot merge prefixes built on different calendars or entities")
+        self.volume = self.volume + other.volume
+        self.revenue = self.revenue + other.revenue
+        self.fees = self.fees + other.fees
+        return self
+
+    @property
+    def dates(self):
+        return pd.date_range(self.start, periods=self.days, freq="D")
+
+    def _window(self, prefix, window):
+        # Every day's trailing window for every entity; windows near the
+        # start of the calendar are clipped to the days available
+        ends = np.arange(1, self.days + 1)
+        return prefix[:, ends] - prefix[:, np.maximum(ends - window, 0)]
+
+    def rolling(self, window):
+        volume = self._window(self.volume, window)
+        revenue = self._window(self.revenue, window)
+        fees = self._window(self.fees, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_fee = np.where(volume > 0, fees / volume, np.nan)
+        return {'volume': volume, 'revenue': revenue, 'avg_fee': avg_fee}
+
+    def window(self, entity, day, window):
+        # O(1) totals for one entity over the window ending on `day`
+        row = self.index[entity]
+        end = min((pd.Timestamp(day) - self.start).days + 1, self.days)
+        begin = max(end - window, 0)
+        volume = self.volume[row, end] - self.volume[row, begin]
+        revenue = self.revenue[row, end] - self.revenue[row, begin]
+        fees = self.fees[row, end] - self.fees[row, begin]
+        return {'volume': volume, 'revenue': revenue, 'avg_fee': fees / volume if volume else np.nan}
+
+    def frame(self, window, metric):
+        # Long format (Date, entity, value) for plotting
+        values = self.rolling(window)[metric]
+        return pd.DataFrame({
+            'Date': np.tile(self.dates, len(self.entities)),
+            'Entity': np.repeat(self.entities, self.days),
+            'Value': values.reshape(-1),
+        })
+
+    def latest(self, window):
+        # Last full window per entity, and week-over-week change: the last 7
+        # days against the 7 before them
+        last = self.days
+        rows = {}
+        for name, prefix in (('volume', self.volume), ('revenue', self.revenue), ('fees', self.fees)):
+            rows[name] = prefix[:, last] - prefix[:, max(last - window, 0)]
+            rows[f"{name}_this_week"] = prefix[:, last] - prefix[:, max(last - 7, 0)]
+            rows[f"{name}_last_week"] = prefix[:, max(last - 7, 0)] - prefix[:, max(last - 14, 0)]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table = pd.DataFrame({
+                'Entity': self.entities,
+                'Volume': rows['volume'],
+                'Revenue': rows['revenue'],
+                'Avg Fee': np.where(rows['volume'] > 0, rows['fees'] / rows['volume'], np.nan),
+                'Volume WoW': _change(rows['volume_this_week'], rows['volume_last_week']),
+                'Revenue WoW': _change(rows['revenue_this_week'], rows['revenue_last_week']),
+            })
+        return table
+
+
+def _change(current, previous):
+    return np.where(previous > 0, (current - previous) / previous, np.nan)
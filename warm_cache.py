@@ -0,0 +1,137 @@
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+from appointment_store import DATA_DIR
+
+# Disk cache that survives restarts and redeploys.
+#
+# Entries are keyed by a fingerprint of their inputs: generator parameters
+# and the checksums of the source files the data comes from. DataFrames are
+# stored as uncompressed Arrow IPC files and read back memory-mapped, so a
+# fresh process loads a cached dataset in milliseconds instead of
+# regenerating it. Other rollups (moment accumulators, sketches) are pickled.
+#
+#   data/cache/v<CACHE_VERSION>/<name>-<fingerprint>.arrow|.pkl
+#
+# Bumping CACHE_VERSION drops every older version directory. The cache is
+# bounded by WARM_CACHE_MAX_BYTES: after each write the least recently used
+# entries are removed until it fits again.
+
+CACHE_DIR = DATA_DIR / "cache"
+CACHE_VERSION = 1
+MAX_CACHE_BYTES = int(os.environ.get("WARM_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(*params, files=()):
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for param in params:
+        digest.update(repr(param).encode())
+    for path in files:
+        digest.update(file_checksum(path).encode())
+    return digest.hexdigest()[:16]
+
+
+class WarmCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = Path(root)
+        self.dir = self.root / f"v{CACHE_VERSION}"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._drop_old_versions()
+
+    def _drop_old_versions(self):
+        if not self.root.exists():
+            return
+        for old in self.root.glob("v*"):
+            if old != self.dir and old.is_dir():
+                for path in old.iterdir():
+                    path.unlink(missing_ok=True)
+                old.rmdir()
+
+    def _path(self, name, key, suffix):
+        return self.dir / f"{name}-{key}{suffix}"
+
+    def _write(self, path, write):
+        # Write to a temp file and rename, so readers never see half a file
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        write(tmp)
+        os.replace(tmp, path)
+        self.evict()
+
+    def _hit(self, path):
+        self.hits += 1
+        os.utime(path)
+
+    def frame(self, name, key, build):
+        # pyarrow only loads once a frame is actually read or written
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        path = self._path(name, key, ".arrow")
+        try:
+            with pa.memory_map(str(path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+            self._hit(path)
+            return table.to_pandas()
+        except FileNotFoundError:
+            pass
+        self.misses += 1
+        df = build()
+        self._write(path, lambda tmp: feather.write_feather(df, tmp, compression="uncompressed"))
+        return df
+
+    def object(self, name, key, build):
+        path = self._path(name, key, ".pkl")
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            self._hit(path)
+            return value
+        except FileNotFoundError:
+            pass
+        self.misses += 1
+        value = build()
+
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._write(path, write)
+        return value
+
+    def size(self):
+        return sum(path.stat().st_size for path in self.dir.glob("*") if path.is_file()) if self.dir.exists() else 0
+
+    def evict(self):
+        entries = []
+        for path in self.dir.glob("*"):
+            if path.suffix in (".arrow", ".pkl"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for path in self.dir.glob("*"):
+            path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=None)
+def get_warm_cache():
+    return WarmCache()